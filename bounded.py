@@ -0,0 +1,130 @@
+"""Solvers whose memory is bounded by the length of the path they hold, not by the size of the maze.
+
+A SearchWorkspace, which a_star and dijkstra run on, keeps four arrays over every cell (24 bytes per cell on
+common platforms; see SearchWorkspace.nbytes) plus an open heap that can grow to the whole frontier. The solvers
+here keep no per-cell state at all, so they suit workers that cannot afford arrays over a very large maze, at the
+price of doing more work."""
+from array import array
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from search import HeuristicFactory, resolve_heuristic
+
+# Headings in clockwise order, so turning right is heading + 1 and turning back is heading + 2.
+UP, RIGHT, DOWN, LEFT = range(4)
+ROW_STEP = (-1, 0, 1, 0)
+COL_STEP = (0, 1, 0, -1)
+HEADING_OF = {(ROW_STEP[heading], COL_STEP[heading]): heading for heading in range(4)}
+
+
+def wall_follower(maze, starts: Iterable[int], goals: Iterable[int]) -> Iterator[Tuple[int, int, bool]]:
+    """Walk with the right hand on the wall from each start in turn until a goal is reached.
+
+    Every move is yielded as it is made. A move straight back along the last move of the current path (leaving a
+    dead end) is yielded as an undo step, so the forward steps left over form the path. The walker itself is a
+    position and a heading; the only thing that grows is one byte per cell of the current path, which is needed
+    to tell backtracks apart.
+
+    The rule always finds a goal in a simply connected (perfect) maze. With loops it can circle an island that
+    holds no goal; a walk ends after 4 * num_rows * num_cols moves, enough to visit every (cell, heading) state
+    once, its path is undone and the next start is tried. Yields nothing more if no start reaches a goal."""
+    num_cols = maze.num_cols
+    goals = set(goals)
+    max_moves = 4 * maze.num_rows * num_cols
+    for start in starts:
+        if start in goals:
+            return
+        i, j = divmod(start, num_cols)
+        heading = DOWN
+        headings = bytearray()  # Heading of every move on the current path
+        for _ in range(max_moves):
+            open_positions = maze._open_neighbor_positions(i, j)
+            for turn in (1, 0, 3, 2):  # Right, straight on, left, back
+                direction = (heading + turn) % 4
+                if (i + ROW_STEP[direction], j + COL_STEP[direction]) in open_positions:
+                    break
+            else:
+                break  # Walled in on every side
+            heading = direction
+            current = i * num_cols + j
+            i, j = i + ROW_STEP[direction], j + COL_STEP[direction]
+            if headings and headings[-1] == (direction + 2) % 4:
+                headings.pop()
+                yield (i * num_cols + j, current, True)
+            else:
+                headings.append(direction)
+                yield (current, i * num_cols + j, False)
+            if i * num_cols + j in goals:
+                return
+
+        while headings:
+            direction = headings.pop()
+            previous = (i - ROW_STEP[direction]) * num_cols + j - COL_STEP[direction]
+            yield (previous, i * num_cols + j, True)
+            i, j = divmod(previous, num_cols)
+
+
+def _open_headings(maze, cell_id: int) -> int:
+    """Return a 4-bit mask of the headings that leave cell_id without crossing a wall."""
+    i, j = divmod(cell_id, maze.num_cols)
+    mask = 0
+    for ni, nj in maze._open_neighbor_positions(i, j):
+        mask |= 1 << HEADING_OF[(ni - i, nj - j)]
+    return mask
+
+
+def ida_star(maze, starts: Iterable[int], goals: Iterable[int],
+             heuristic: Union[str, HeuristicFactory] = "manhattan") -> Optional[List[int]]:
+    """Return the cell ids of a cheapest path from any start to the nearest goal, or None if no goal is reachable.
+
+    Iterative-deepening A*: a depth-first search that abandons a branch once g + heuristic exceeds a bound, and
+    restarts with the bound raised to the smallest f that exceeded it until a goal is found. Only the current path
+    is kept: flat arrays of its cell ids and g-scores, one byte per path cell holding its open headings and the
+    next heading to try, and a set of the cells on it so that every branch stays a simple path. Memory therefore
+    grows with the path, not the maze, paid for by expanding cells again on every iteration. On a perfect maze
+    each iteration is linear in the cells within the bound; on a maze with loops the same cell is reached along
+    many paths, which can make IDA* far slower than A*. Heuristics work as in SearchWorkspace.a_star."""
+    num_cols = maze.num_cols
+    costs = maze._costs
+    goal_set = set(goals)
+    starts = list(dict.fromkeys(starts))
+    estimate = resolve_heuristic(heuristic)(maze, goal_set)
+
+    for start in starts:
+        if start in goal_set:
+            return [start]
+    bound = min(estimate(start) for start in starts)
+    max_cost = (maze.num_rows * num_cols - 1) * maze._max_cost  # No simple path costs more than this
+    while True:
+        next_bound = None  # Smallest f that exceeded the bound in this iteration
+        for start in starts:
+            path, path_g, frames = array("q", [start]), array("q", [0]), bytearray([_open_headings(maze, start)])
+            on_path = {start}
+            while path:
+                frame = frames[-1]
+                heading = frame >> 4
+                if heading == 4:  # Every heading tried; back out of this cell
+                    on_path.discard(path.pop())
+                    path_g.pop()
+                    frames.pop()
+                    continue
+                frames[-1] = frame + 16
+                if not frame >> heading & 1:
+                    continue
+                neighbor = path[-1] + ROW_STEP[heading] * num_cols + COL_STEP[heading]
+                if neighbor in on_path:
+                    continue
+                g = path_g[-1] + (costs[neighbor] if costs else 1)
+                f = g + estimate(neighbor)
+                if f > bound:
+                    if next_bound is None or f < next_bound:
+                        next_bound = f
+                    continue
+                if neighbor in goal_set:
+                    return path.tolist() + [neighbor]
+                path.append(neighbor)
+                path_g.append(g)
+                on_path.add(neighbor)
+                frames.append(_open_headings(maze, neighbor))
+        if next_bound is None or next_bound > max_cost:
+            return None
+        bound = next_bound
@@ -0,0 +1,272 @@
+"""Maze generation algorithms, selectable by name in Maze.generate."""
+from array import array
+from typing import Callable, Dict, Iterator, List, Tuple
+import random
+
+import vectorized
+
+Generator = Callable[[object], None]
+
+GENERATORS: Dict[str, Generator] = {}
+
+
+def register_generator(name: str) -> Callable[[Generator], Generator]:
+    """Decorator that makes a function carving passages into a fully walled maze available to Maze.generate."""
+    def register(generator: Generator) -> Generator:
+        GENERATORS[name] = generator
+        return generator
+    return register
+
+
+class DisjointSet:
+    """Union-find over the integers 0..size-1 with path compression and union by rank."""
+
+    def __init__(self, size: int) -> None:
+        self.parent = array("q", range(size))
+        self.rank = bytearray(size)
+
+    def find(self, item: int) -> int:
+        """Return the representative of item's set, pointing every element on the way directly at it."""
+        parent = self.parent
+        root = item
+        while parent[root] != root:
+            root = parent[root]
+        while parent[item] != root:
+            parent[item], item = root, parent[item]
+        return root
+
+    def union(self, a: int, b: int) -> bool:
+        """Merge the sets of a and b; return False if they were already the same set."""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        rank = self.rank
+        if rank[root_a] < rank[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        if rank[root_a] == rank[root_b]:
+            rank[root_a] += 1
+        return True
+
+
+class RandomSet:
+    """A set of integers 0..size-1 with O(1) add, membership test and removal of a random member.
+
+    Members are kept in a dense array and an index map records where each one sits; a removed member's slot is
+    filled by moving the last member into it."""
+
+    def __init__(self, size: int) -> None:
+        self.items = array("q")
+        self.position = array("q", [-1]) * size  # item -> its index in items, -1 if absent
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, item: int) -> bool:
+        return self.position[item] >= 0
+
+    def add(self, item: int) -> None:
+        """Add item unless it is already present."""
+        if self.position[item] < 0:
+            self.position[item] = len(self.items)
+            self.items.append(item)
+
+    def pop_random(self) -> int:
+        """Remove and return a uniformly chosen member."""
+        k = random.randrange(len(self.items))
+        item = self.items[k]
+        last = self.items.pop()
+        if last != item:
+            self.items[k] = last
+            self.position[last] = k
+        self.position[item] = -1
+        return item
+
+
+@register_generator("backtracker")
+def recursive_backtracker(maze) -> None:
+    """Depth-first carving from the entrance; long winding corridors with few, long dead ends."""
+    maze._break_walls_iterative(0, 0)
+
+
+@register_generator("kruskal")
+def kruskal(maze) -> None:
+    """Randomised Kruskal: visit every interior wall once in random order and remove it if it separates two regions.
+
+    Each cell starts as its own region in a DisjointSet and removing a wall merges two regions, so the result is a
+    spanning tree: a perfect maze. The walls are shuffled once and every union-find operation is near constant, so
+    generation is near-linear and needs neither recursion nor visited flags. Compared with the backtracker the
+    mazes have many short dead ends and a shorter, less winding solution."""
+    num_rows, num_cols = maze.num_rows, maze.num_cols
+    cells = maze.cells
+    # Wall 2 * cell_id is the wall to the cell's right, 2 * cell_id + 1 the wall below it.
+    walls = [2 * (i * num_cols + j) for i in range(num_rows) for j in range(num_cols - 1)]
+    walls += [2 * (i * num_cols + j) + 1 for i in range(num_rows - 1) for j in range(num_cols)]
+    random.shuffle(walls)
+
+    regions = DisjointSet(num_rows * num_cols)
+    remaining = num_rows * num_cols - 1  # Walls still to remove before the maze is a spanning tree
+    for wall in walls:
+        if not remaining:
+            break
+        cell_id, below = divmod(wall, 2)
+        other = cell_id + (num_cols if below else 1)
+        if regions.union(cell_id, other):
+            i, j = divmod(cell_id, num_cols)
+            ni, nj = divmod(other, num_cols)
+            maze._break_walls_between(cells[i][j], i, j, cells[ni][nj], ni, nj)
+            remaining -= 1
+
+
+def eller_rows(num_rows: int, num_cols: int) -> Iterator[Tuple[int, int]]:
+    """Generate a perfect maze with Eller's algorithm, yielding one (right_walls, bottom_walls) pair per row.
+
+    Bit j of right_walls is set when cell j has a wall on its right and bit j of bottom_walls when it has a wall
+    below; the maze border is included. Only the current row's set labels and members are kept, so memory is
+    O(num_cols) however many rows are generated, and rows can be written out or drawn as they arrive.
+
+    Within a row, neighbors in different sets are joined at random; then every set carves down from at least one
+    of its cells, so no region is cut off, and cells that were not carved into start new sets. The last row joins
+    all remaining sets."""
+    full_row = (1 << num_cols) - 1
+    sets = list(range(num_cols))  # Set label of each cell in the current row
+    members: Dict[int, List[int]] = {j: [j] for j in range(num_cols)}
+    next_label = num_cols
+    for i in range(num_rows):
+        last_row = i == num_rows - 1
+        right_walls = 1 << (num_cols - 1)
+        for j in range(num_cols - 1):
+            a, b = sets[j], sets[j + 1]
+            if a != b and (last_row or random.random() < 0.5):
+                if len(members[a]) < len(members[b]):
+                    a, b = b, a  # Relabel the smaller set
+                for k in members[b]:
+                    sets[k] = a
+                members[a] += members.pop(b)
+            else:
+                right_walls |= 1 << j
+        if last_row:
+            yield right_walls, full_row
+            return
+
+        bottom_walls = full_row
+        next_members: Dict[int, List[int]] = {}
+        for label, columns in members.items():
+            down = [k for k in columns if random.random() < 0.5] or [random.choice(columns)]
+            for k in down:
+                bottom_walls &= ~(1 << k)
+            next_members[label] = down
+        for j in range(num_cols):
+            if bottom_walls >> j & 1:
+                sets[j] = next_label
+                next_members[next_label] = [j]
+                next_label += 1
+        members = next_members
+        yield right_walls, bottom_walls
+
+
+@register_generator("eller")
+def eller(maze) -> None:
+    """Carve the rows streamed by eller_rows into the maze; horizontally biased, with short vertical runs."""
+    num_rows, num_cols = maze.num_rows, maze.num_cols
+    cells = maze.cells
+    for i, (right_walls, bottom_walls) in enumerate(eller_rows(num_rows, num_cols)):
+        for j in range(num_cols - 1):
+            if not right_walls >> j & 1:
+                maze._break_walls_between(cells[i][j], i, j, cells[i][j + 1], i, j + 1)
+        if i < num_rows - 1:
+            for j in range(num_cols):
+                if not bottom_walls >> j & 1:
+                    maze._break_walls_between(cells[i][j], i, j, cells[i + 1][j], i + 1, j)
+
+
+@register_generator("wilson")
+def wilson(maze) -> None:
+    """Wilson's algorithm: a uniformly random spanning tree, so every perfect maze is equally likely.
+
+    Starting from a random root, each cell not yet in the tree begins a random walk that runs until it hits the
+    tree; the loop-erased walk is then added to the tree. Loops are erased implicitly: the walk only records the
+    direction it last left each cell in, one byte per cell, and retracing those directions from the start follows
+    the loop-erased path. No per-step containers are built, so memory is two bytes per cell. Unlike the
+    backtracker's long corridors, the mazes have no bias, which makes them a fair benchmark for the solvers."""
+    num_rows, num_cols = maze.num_rows, maze.num_cols
+    cells = maze.cells
+    size = num_rows * num_cols
+    row_steps, col_steps = (-1, 0, 1, 0), (0, -1, 0, 1)  # Up, left, down, right
+    getrandbits = random.getrandbits
+    in_tree = bytearray(size)
+    exit_direction = bytearray(size)  # Direction the current walk last left each cell in
+    in_tree[random.randrange(size)] = 1
+
+    for start in range(size):
+        if in_tree[start]:
+            continue
+        i, j = divmod(start, num_cols)
+        while not in_tree[i * num_cols + j]:
+            while True:
+                direction = getrandbits(2)
+                if (direction == 0 and i > 0) or (direction == 1 and j > 0) or \
+                        (direction == 2 and i < num_rows - 1) or (direction == 3 and j < num_cols - 1):
+                    break
+            exit_direction[i * num_cols + j] = direction
+            i, j = i + row_steps[direction], j + col_steps[direction]
+
+        i, j = divmod(start, num_cols)
+        while not in_tree[i * num_cols + j]:
+            in_tree[i * num_cols + j] = 1
+            direction = exit_direction[i * num_cols + j]
+            ni, nj = i + row_steps[direction], j + col_steps[direction]
+            maze._break_walls_between(cells[i][j], i, j, cells[ni][nj], ni, nj)
+            i, j = ni, nj
+
+
+def _carve_wall_arrays(maze, build_walls) -> None:
+    """Write the interior walls built by a vectorized.*_walls function into the maze, keeping its border."""
+    horizontal, vertical = vectorized.wall_arrays(maze)
+    rng = vectorized.np.random.default_rng(random.getrandbits(64))  # Follows the seeded random module
+    new_horizontal, new_vertical = build_walls(maze.num_rows, maze.num_cols, rng)
+    horizontal[1:-1] = new_horizontal[1:-1]
+    vertical[:, 1:-1] = new_vertical[:, 1:-1]
+    vectorized.write_wall_arrays(maze, horizontal, vertical)
+
+
+@register_generator("binary_tree")
+def binary_tree(maze) -> None:
+    """NumPy binary-tree maze: strongly biased towards the top-left, but generated in a few array operations."""
+    _carve_wall_arrays(maze, vectorized.binary_tree_walls)
+
+
+@register_generator("sidewinder")
+def sidewinder(maze) -> None:
+    """NumPy sidewinder maze: an open top row and vertical passages rising from horizontal runs."""
+    _carve_wall_arrays(maze, vectorized.sidewinder_walls)
+
+
+@register_generator("prim")
+def prim(maze) -> None:
+    """Randomised Prim: grow the maze from a random cell by repeatedly attaching a random frontier cell.
+
+    The frontier (cells next to the maze but not in it) is a RandomSet, so adding a cell and drawing a random one
+    are both O(1) and generation is linear. Each drawn cell is joined to a random neighbor already in the maze.
+    The maze spreads out evenly from the first cell, giving many short dead ends and a short, direct solution."""
+    num_rows, num_cols = maze.num_rows, maze.num_cols
+    cells = maze.cells
+    size = num_rows * num_cols
+    in_maze = bytearray(size)
+    frontier = RandomSet(size)
+    first = random.randrange(size)
+    in_maze[first] = 1
+    for ni, nj in maze._neighbor_positions(*divmod(first, num_cols)):
+        frontier.add(ni * num_cols + nj)
+
+    while frontier:
+        i, j = divmod(frontier.pop_random(), num_cols)
+        inside = []
+        for ni, nj in maze._neighbor_positions(i, j):
+            if in_maze[ni * num_cols + nj]:
+                inside.append((ni, nj))
+            else:
+                frontier.add(ni * num_cols + nj)
+        ni, nj = random.choice(inside)
+        maze._break_walls_between(cells[i][j], i, j, cells[ni][nj], ni, nj)
+        in_maze[i * num_cols + j] = 1
@@ -0,0 +1,230 @@
+"""Compact bit-packed wall storage for large mazes."""
+from models import Drawable, Cell, DEFAULT_WIDTH
+from typing import Iterator, List, Tuple
+
+class WallGrid:
+    """Stores the walls of a maze as two packed bit arrays.
+
+    Horizontal edge (r, c) is the top wall of cell (r, c); row num_rows holds the bottom border.
+    Vertical edge (r, c) is the left wall of cell (r, c); column num_cols holds the right border.
+    A set bit means the wall is present, so every interior wall is stored exactly once."""
+    __slots__ = ("num_rows", "num_cols", "horizontal", "vertical")
+
+    def __init__(self, num_rows: int, num_cols: int) -> None:
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.horizontal = bytearray(b"\xff") * (((num_rows + 1) * num_cols + 7) >> 3)
+        self.vertical = bytearray(b"\xff") * ((num_rows * (num_cols + 1) + 7) >> 3)
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes used by the wall bits."""
+        return len(self.horizontal) + len(self.vertical)
+
+    def _edge(self, row: int, col: int, side: str) -> Tuple[bytearray, int]:
+        """Return the bit array and bit index holding the given wall of cell (row, col)."""
+        if side == "top":
+            return self.horizontal, row * self.num_cols + col
+        if side == "bottom":
+            return self.horizontal, (row + 1) * self.num_cols + col
+        if side == "left":
+            return self.vertical, row * (self.num_cols + 1) + col
+        if side == "right":
+            return self.vertical, row * (self.num_cols + 1) + col + 1
+        raise ValueError(f"Unknown side: {side}")
+
+    def has_wall(self, row: int, col: int, side: str) -> bool:
+        """Return True if the given wall of cell (row, col) is present."""
+        bits, k = self._edge(row, col, side)
+        return bool(bits[k >> 3] >> (k & 7) & 1)
+
+    def set_wall(self, row: int, col: int, side: str, present: bool) -> None:
+        """Add or remove the given wall of cell (row, col)."""
+        bits, k = self._edge(row, col, side)
+        if present:
+            bits[k >> 3] |= 1 << (k & 7)
+        else:
+            bits[k >> 3] &= ~(1 << (k & 7))
+
+    def open_neighbors(self, row: int, col: int) -> List[Tuple[int, int]]:
+        """Return the positions reachable from cell (row, col) without crossing a wall, in top, left, bottom, right order."""
+        num_rows, num_cols = self.num_rows, self.num_cols
+        horizontal, vertical = self.horizontal, self.vertical
+        positions = []
+        k = row * num_cols + col
+        if row > 0 and not horizontal[k >> 3] >> (k & 7) & 1:
+            positions.append((row - 1, col))
+        k = row * (num_cols + 1) + col
+        if col > 0 and not vertical[k >> 3] >> (k & 7) & 1:
+            positions.append((row, col - 1))
+        k = (row + 1) * num_cols + col
+        if row < num_rows - 1 and not horizontal[k >> 3] >> (k & 7) & 1:
+            positions.append((row + 1, col))
+        k = row * (num_cols + 1) + col + 1
+        if col < num_cols - 1 and not vertical[k >> 3] >> (k & 7) & 1:
+            positions.append((row, col + 1))
+        return positions
+
+    def open_between(self, i1: int, j1: int, i2: int, j2: int) -> None:
+        """Remove the wall shared by two adjacent cells with a single bit flip."""
+        self.set_wall(i1, j1, self._shared_side(i1, j1, i2, j2), False)
+
+    def close_between(self, i1: int, j1: int, i2: int, j2: int) -> None:
+        """Restore the wall shared by two adjacent cells."""
+        self.set_wall(i1, j1, self._shared_side(i1, j1, i2, j2), True)
+
+    @staticmethod
+    def _shared_side(i1: int, j1: int, i2: int, j2: int) -> str:
+        """Return the side of cell (i1, j1) that faces the adjacent cell (i2, j2)."""
+        if i1 == i2 and abs(j1 - j2) == 1:
+            return "right" if j1 < j2 else "left"
+        if j1 == j2 and abs(i1 - i2) == 1:
+            return "bottom" if i1 < i2 else "top"
+        raise ValueError(f"Cells at ({i1}, {j1}) and ({i2}, {j2}) are not adjacent")
+
+
+class CellView(Drawable):
+    """A lightweight stand-in for models.Cell whose walls live in a WallGrid.
+
+    Views are created on demand and hold no state of their own, so two views of the same
+    position are equal and interchangeable."""
+    __slots__ = ("_grid", "row", "col")
+    color = "black"
+    width = DEFAULT_WIDTH
+    draw = Cell.draw
+
+    def __init__(self, grid: "CellGrid", row: int, col: int) -> None:
+        self._grid = grid
+        self.row = row
+        self.col = col
+
+    @property
+    def x1(self) -> int:
+        return self._grid.x1 + self.col * self._grid.cell_size_x
+
+    @property
+    def y1(self) -> int:
+        return self._grid.y1 + self.row * self._grid.cell_size_y
+
+    @property
+    def x2(self) -> int:
+        return self.x1 + self._grid.cell_size_x
+
+    @property
+    def y2(self) -> int:
+        return self.y1 + self._grid.cell_size_y
+
+    def _wall_property(side: str):
+        def getter(self) -> bool:
+            return self._grid.walls.has_wall(self.row, self.col, side)
+        def setter(self, present: bool) -> None:
+            self._grid.walls.set_wall(self.row, self.col, side, present)
+        return property(getter, setter)
+
+    has_top_wall = _wall_property("top")
+    has_left_wall = _wall_property("left")
+    has_bottom_wall = _wall_property("bottom")
+    has_right_wall = _wall_property("right")
+    del _wall_property
+
+    @property
+    def visited(self) -> bool:
+        return self._grid.is_visited(self.row, self.col)
+
+    @visited.setter
+    def visited(self, value: bool) -> None:
+        self._grid.set_visited(self.row, self.col, value)
+
+    def __hash__(self):
+        return hash((self.x1, self.y1, self.x2, self.y2))
+
+    def __eq__(self, other):
+        if isinstance(other, CellView):
+            return self._grid is other._grid and self.row == other.row and self.col == other.col
+        return False
+
+    def __repr__(self) -> str:
+        return f"CellView(row={self.row}, col={self.col})"
+
+
+class _CellRow:
+    """One row of a CellGrid, indexable like a list of cells."""
+    __slots__ = ("_grid", "_row")
+
+    def __init__(self, grid: "CellGrid", row: int) -> None:
+        self._grid = grid
+        self._row = row
+
+    def __len__(self) -> int:
+        return self._grid.num_cols
+
+    def __getitem__(self, col: int) -> CellView:
+        if col < 0:
+            col += self._grid.num_cols
+        if not 0 <= col < self._grid.num_cols:
+            raise IndexError("column index out of range")
+        return CellView(self._grid, self._row, col)
+
+    def __iter__(self) -> Iterator[CellView]:
+        for col in range(self._grid.num_cols):
+            yield CellView(self._grid, self._row, col)
+
+
+class CellGrid:
+    """A read-through List[List[Cell]] replacement backed by a WallGrid.
+
+    Only the wall bits and a packed visited bitmap are stored; cells are materialised as
+    CellView objects when indexed."""
+
+    def __init__(self, walls: WallGrid, x1: int, y1: int, cell_size_x: int, cell_size_y: int) -> None:
+        self.walls = walls
+        self.x1 = x1
+        self.y1 = y1
+        self.cell_size_x = cell_size_x
+        self.cell_size_y = cell_size_y
+        self._visited = None
+
+    @property
+    def num_rows(self) -> int:
+        return self.walls.num_rows
+
+    @property
+    def num_cols(self) -> int:
+        return self.walls.num_cols
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def __getitem__(self, row: int) -> _CellRow:
+        if row < 0:
+            row += self.num_rows
+        if not 0 <= row < self.num_rows:
+            raise IndexError("row index out of range")
+        return _CellRow(self, row)
+
+    def __iter__(self) -> Iterator[_CellRow]:
+        for row in range(self.num_rows):
+            yield _CellRow(self, row)
+
+    def is_visited(self, row: int, col: int) -> bool:
+        """Return the visited flag of cell (row, col)."""
+        if self._visited is None:
+            return False
+        k = row * self.num_cols + col
+        return bool(self._visited[k >> 3] >> (k & 7) & 1)
+
+    def set_visited(self, row: int, col: int, value: bool) -> None:
+        """Set the visited flag of cell (row, col)."""
+        if self._visited is None:
+            if not value:
+                return
+            self._visited = bytearray((self.num_rows * self.num_cols + 7) >> 3)
+        k = row * self.num_cols + col
+        if value:
+            self._visited[k >> 3] |= 1 << (k & 7)
+        else:
+            self._visited[k >> 3] &= ~(1 << (k & 7))
+
+    def reset_visited(self) -> None:
+        """Clear the visited flag of every cell."""
+        self._visited = None
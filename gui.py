@@ -58,8 +58,8 @@ class Window:
         maze.draw(self.__canvas)
 
     def animate_solution(self, maze: Maze, algorithm: str):
-        """Animate the solution of the given maze."""
-        solution_steps = maze.solve(algorithm=algorithm)
+        """Animate the solution of the given maze, drawing each step as soon as the solver produces it."""
+        solution_steps = maze.solve(algorithm=algorithm, stream=True)
         for from_cell, to_cell, is_undo in solution_steps:
             self.draw_move(from_cell, to_cell, is_undo)
 
@@ -0,0 +1,144 @@
+"""Hierarchical path planning (HPA*) for very large mazes."""
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+import heapq
+
+DEFAULT_CLUSTER_SIZE = 16
+
+class HierarchicalPlanner:
+    """Answers path queries on an abstract graph of cluster entrances before refining them cell by cell.
+
+    The grid is split into cluster_size x cluster_size clusters. Every cell next to an open passage into another
+    cluster is an entrance node; entrances on either side of a passage are joined by an edge of weight 1, and
+    entrances of the same cluster are joined by the length of the shortest path between them inside the cluster.
+    A query attaches its starts and goals to the entrances of their own clusters, runs A* on the abstract graph,
+    and expands each abstract edge into cells. Because every crossing between clusters is a node the result is a
+    shortest path. Expanded intra-cluster paths are cached on the planner and reused by later queries."""
+
+    def __init__(self, maze, cluster_size: int = DEFAULT_CLUSTER_SIZE) -> None:
+        if cluster_size < 1:
+            raise ValueError(f"cluster_size must be positive, got {cluster_size}")
+        self.maze = maze
+        self.cluster_size = cluster_size
+        self.edges: Dict[int, Dict[int, int]] = {}  # entrance -> {entrance: moves}
+        self._refined: Dict[Tuple[int, int], List[int]] = {}
+
+        num_rows, num_cols = maze.num_rows, maze.num_cols
+        entrances: Dict[Tuple[int, int], List[int]] = {}  # cluster -> entrances in it
+        for i in range(num_rows):
+            for j in range(num_cols):
+                last_row = (i + 1) % cluster_size == 0
+                last_col = (j + 1) % cluster_size == 0
+                if not (last_row or last_col):
+                    continue
+                for ni, nj in maze._open_neighbor_positions(i, j):
+                    if (ni > i and last_row) or (nj > j and last_col):
+                        a, b = i * num_cols + j, ni * num_cols + nj
+                        for node in (a, b):
+                            if node not in self.edges:
+                                self.edges[node] = {}
+                                entrances.setdefault(self._cluster_of(node), []).append(node)
+                        self.edges[a][b] = self.edges[b][a] = 1
+
+        for nodes in entrances.values():
+            for node in nodes:
+                distances, _ = self._search_cluster(node)
+                for other in nodes:
+                    if other != node and other in distances:
+                        self.edges[node][other] = distances[other]
+
+    def _cluster_of(self, cell_id: int) -> Tuple[int, int]:
+        i, j = divmod(cell_id, self.maze.num_cols)
+        return i // self.cluster_size, j // self.cluster_size
+
+    def _search_cluster(self, source: int) -> Tuple[Dict[int, int], Dict[int, Optional[int]]]:
+        """Breadth-first search from source that never leaves its cluster; returns (distances, parents)."""
+        num_cols = self.maze.num_cols
+        cluster = self._cluster_of(source)
+        distances = {source: 0}
+        parents: Dict[int, Optional[int]] = {source: None}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            i, j = divmod(current, num_cols)
+            for ni, nj in self.maze._open_neighbor_positions(i, j):
+                neighbor = ni * num_cols + nj
+                if neighbor not in parents and self._cluster_of(neighbor) == cluster:
+                    parents[neighbor] = current
+                    distances[neighbor] = distances[current] + 1
+                    queue.append(neighbor)
+        return distances, parents
+
+    def _refine(self, a: int, b: int) -> List[int]:
+        """Expand one abstract edge into the cells from a to b."""
+        if self._cluster_of(a) != self._cluster_of(b):
+            return [a, b]  # A passage between neighboring clusters
+        cacheable = a in self.edges and b in self.edges
+        if cacheable and (a, b) in self._refined:
+            return self._refined[(a, b)]
+        _, parents = self._search_cluster(a)
+        path = [b]
+        while parents[path[-1]] is not None:
+            path.append(parents[path[-1]])
+        path.reverse()
+        if cacheable:
+            self._refined[(a, b)] = path
+        return path
+
+    def shortest_path(self, starts: Iterable[int], goals: Iterable[int]) -> Optional[List[int]]:
+        """Return the cell ids of a shortest path from any start to the nearest goal, or None if none is reachable."""
+        num_cols = self.maze.num_cols
+        starts, goals = list(starts), set(goals)
+        goal_positions = [divmod(goal, num_cols) for goal in goals]
+        if any(start in goals for start in starts):
+            return [next(start for start in starts if start in goals)]
+
+        # Query-local edges: starts to the entrances and goals of their clusters, and entrances into each goal.
+        links: Dict[int, Dict[int, int]] = {}
+        for start in starts:
+            distances, _ = self._search_cluster(start)
+            links[start] = {cell: moves for cell, moves in distances.items()
+                            if cell != start and (cell in self.edges or cell in goals)}
+        for goal in goals:
+            distances, _ = self._search_cluster(goal)
+            for cell, moves in distances.items():
+                if cell in self.edges and cell != goal:
+                    links.setdefault(cell, {})[goal] = moves
+
+        def heuristic(cell_id: int) -> int:
+            i, j = divmod(cell_id, num_cols)
+            return min(abs(i - goal_i) + abs(j - goal_j) for goal_i, goal_j in goal_positions)
+
+        distance = {start: 0 for start in starts}
+        came_from: Dict[int, Optional[int]] = {start: None for start in starts}
+        open_heap = [(heuristic(start), k, start) for k, start in enumerate(starts)]
+        heapq.heapify(open_heap)
+        counter = len(open_heap)
+        closed = set()
+        while open_heap:
+            _, _, node = heapq.heappop(open_heap)
+            if node in closed:
+                continue
+            if node in goals:
+                return self._expand(node, came_from)
+            closed.add(node)
+            for neighbors in (self.edges.get(node, {}), links.get(node, {})):
+                for neighbor, moves in neighbors.items():
+                    tentative = distance[node] + moves
+                    if neighbor not in closed and tentative < distance.get(neighbor, tentative + 1):
+                        distance[neighbor] = tentative
+                        came_from[neighbor] = node
+                        counter += 1
+                        heapq.heappush(open_heap, (tentative + heuristic(neighbor), counter, neighbor))
+        return None
+
+    def _expand(self, node: int, came_from: Dict[int, Optional[int]]) -> List[int]:
+        """Turn the abstract path ending at node into cells."""
+        abstract = [node]
+        while came_from[abstract[-1]] is not None:
+            abstract.append(came_from[abstract[-1]])
+        abstract.reverse()
+        path = [abstract[0]]
+        for a, b in zip(abstract, abstract[1:]):
+            path.extend(self._refine(a, b)[1:])
+        return path
@@ -0,0 +1,143 @@
+"""Incremental replanning (D* Lite) for mazes whose walls change between queries."""
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+import heapq
+
+INFINITY = 2 ** 62  # Cost of an unreachable cell; far above any real path cost
+Position = Tuple[int, int]
+
+
+class IncrementalPlanner:
+    """Keeps a shortest path from a start to the nearest goal up to date while walls are opened and closed.
+
+    This is D* Lite: the search runs backwards from the goals, so every cell holds g, its cost to the nearest goal,
+    and rhs, the one-step lookahead min(cost of entering a neighbor + that neighbor's g). A cell whose g and rhs
+    differ is inconsistent and sits on the priority queue. A wall change only makes the two cells beside it
+    inconsistent, and the next query propagates the change outward from them, stopping as soon as the start is
+    consistent again, so a small edit repairs the previous search instead of redoing it. The start may also move
+    along the path (move_to) without discarding the search, which is what the km key offset is for.
+
+    Entering a cell costs its traversal cost (see Maze.set_cell_cost); costs must not change while the planner is
+    in use. The planner holds two arrays over every cell."""
+
+    def __init__(self, maze, start: int, goals: Iterable[int]) -> None:
+        self.maze = maze
+        self.start = start
+        self.goals = set(goals)
+        self.expanded = 0  # Cells expanded by the last shortest_path call
+        size = maze.num_rows * maze.num_cols
+        self.g = array("q", [INFINITY]) * size
+        self.rhs = array("q", [INFINITY]) * size
+        self._scale = maze.min_cell_cost
+        self._km = 0
+        self._last_start = start
+        self._queued: Dict[int, Tuple[int, int]] = {}  # cell -> its key while on the queue
+        self._queue: List[Tuple[int, int, int]] = []
+        for goal in self.goals:
+            self.rhs[goal] = 0
+            self._push(goal)
+
+    def _neighbors(self, cell_id: int) -> List[int]:
+        num_cols = self.maze.num_cols
+        i, j = divmod(cell_id, num_cols)
+        return [ni * num_cols + nj for ni, nj in self.maze._open_neighbor_positions(i, j)]
+
+    def _cost(self, cell_id: int) -> int:
+        costs = self.maze._costs
+        return costs[cell_id] if costs else 1
+
+    def _heuristic(self, cell_id: int) -> int:
+        """Moves from the start to cell_id ignoring walls, times the cheapest cell cost."""
+        num_cols = self.maze.num_cols
+        (i1, j1), (i2, j2) = divmod(self.start, num_cols), divmod(cell_id, num_cols)
+        return (abs(i1 - i2) + abs(j1 - j2)) * self._scale
+
+    def _key(self, cell_id: int) -> Tuple[int, int]:
+        best = min(self.g[cell_id], self.rhs[cell_id])
+        return (best + self._heuristic(cell_id) + self._km, best)
+
+    def _push(self, cell_id: int) -> None:
+        key = self._queued[cell_id] = self._key(cell_id)
+        heapq.heappush(self._queue, (key[0], key[1], cell_id))
+
+    def _top_key(self) -> Tuple[int, int]:
+        """Return the smallest key on the queue, dropping entries that were superseded or removed."""
+        queue = self._queue
+        while queue and self._queued.get(queue[0][2]) != queue[0][:2]:
+            heapq.heappop(queue)
+        return queue[0][:2] if queue else (INFINITY, INFINITY)
+
+    def _update(self, cell_id: int) -> None:
+        """Recompute rhs of a cell and put it on the queue if it is inconsistent, or take it off if it is not."""
+        if cell_id not in self.goals:
+            g, rhs = self.g, INFINITY
+            for neighbor in self._neighbors(cell_id):
+                rhs = min(rhs, self._cost(neighbor) + g[neighbor])
+            self.rhs[cell_id] = min(rhs, INFINITY)
+        if self.g[cell_id] != self.rhs[cell_id]:
+            self._push(cell_id)
+        else:
+            self._queued.pop(cell_id, None)
+
+    def _compute(self) -> None:
+        """Expand inconsistent cells in key order until the start is consistent and nothing cheaper is queued."""
+        g, rhs, start = self.g, self.rhs, self.start
+        self.expanded = 0
+        while self._top_key() < self._key(start) or rhs[start] != g[start]:
+            old_key = self._top_key()
+            if old_key == (INFINITY, INFINITY):
+                break  # Queue exhausted: the start cannot reach a goal
+            _, _, current = heapq.heappop(self._queue)
+            del self._queued[current]
+            self.expanded += 1
+            new_key = self._key(current)
+            if old_key < new_key:
+                self._push(current)  # Its key grew after the start moved; requeue it
+            elif g[current] > rhs[current]:
+                g[current] = rhs[current]
+                for neighbor in self._neighbors(current):
+                    self._update(neighbor)
+            else:
+                g[current] = INFINITY
+                self._update(current)
+                for neighbor in self._neighbors(current):
+                    self._update(neighbor)
+
+    def shortest_path(self) -> Optional[List[int]]:
+        """Return the cell ids of a cheapest path from the start to the nearest goal, or None if none is reachable.
+
+        Only the cells affected by wall changes since the last call are expanded again."""
+        self._compute()
+        if self.g[self.start] >= INFINITY:
+            return None
+        path = [self.start]
+        while path[-1] not in self.goals:
+            path.append(min(self._neighbors(path[-1]), key=lambda neighbor: self._cost(neighbor) + self.g[neighbor]))
+        return path
+
+    def move_to(self, start: int) -> None:
+        """Move the start to another cell, typically the next cell of the current path, keeping the search."""
+        self.start = start
+        self._km += self._heuristic(self._last_start)
+        self._last_start = start
+
+    def walls_changed(self, pairs: Iterable[Tuple[Position, Position]]) -> None:
+        """Tell the planner that the walls between these pairs of adjacent (row, col) positions were changed."""
+        num_cols = self.maze.num_cols
+        for (i1, j1), (i2, j2) in pairs:
+            self._update(i1 * num_cols + j1)
+            self._update(i2 * num_cols + j2)
+
+    def open_wall(self, position1: Position, position2: Position) -> None:
+        """Break the walls between two adjacent (row, col) positions and record the change."""
+        cells = self.maze.cells
+        (i1, j1), (i2, j2) = position1, position2
+        self.maze._break_walls_between(cells[i1][j1], i1, j1, cells[i2][j2], i2, j2)
+        self.walls_changed([(position1, position2)])
+
+    def close_wall(self, position1: Position, position2: Position) -> None:
+        """Restore the walls between two adjacent (row, col) positions and record the change."""
+        cells = self.maze.cells
+        (i1, j1), (i2, j2) = position1, position2
+        self.maze._add_walls_between(cells[i1][j1], i1, j1, cells[i2][j2], i2, j2)
+        self.walls_changed([(position1, position2)])
@@ -0,0 +1,159 @@
+"""Maze graph with corridors contracted into weighted edges."""
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+import heapq
+
+class JunctionGraph:
+    """The maze as a graph of junctions and dead ends joined by corridor edges.
+
+    Every cell with other than two open sides becomes a node. Each run of two-sided cells between two nodes is
+    contracted into one edge whose weight is the number of moves along it, and the run itself (both end nodes
+    included) is kept so a path over edges can be expanded back to cells. Every corridor cell records its edge and
+    its offset along the run, so queries may start or end in the middle of a corridor."""
+
+    def __init__(self, maze) -> None:
+        self.maze = maze
+        num_cols = maze.num_cols
+        size = maze.num_rows * num_cols
+
+        def neighbors(cell_id: int) -> List[int]:
+            i, j = divmod(cell_id, num_cols)
+            return [ni * num_cols + nj for ni, nj in maze._open_neighbor_positions(i, j)]
+
+        self.runs: List[List[int]] = []
+        self.adjacency: Dict[int, List[Tuple[int, int]]] = {}  # node -> [(edge index, node at the other end)]
+        self.edge_of = array("q", [-1]) * size  # corridor cell -> edge index, -1 for nodes
+        self.offset_of = array("q", [0]) * size  # corridor cell -> position in its edge's run
+
+        nodes = [cell_id for cell_id in range(size) if len(neighbors(cell_id)) != 2]
+        for node in nodes:
+            self.adjacency[node] = []
+        for node in nodes:
+            self._walk_corridors(node, neighbors)
+
+        # Closed loops of two-sided cells have no junction to start from; promote one cell of each to a node.
+        for cell_id in range(size):
+            if cell_id not in self.adjacency and self.edge_of[cell_id] < 0:
+                self.adjacency[cell_id] = []
+                self._walk_corridors(cell_id, neighbors)
+
+    def _walk_corridors(self, node: int, neighbors) -> None:
+        """Follow every corridor leaving node that has not been contracted yet and add it as an edge."""
+        for first in neighbors(node):
+            if self.edge_of[first] >= 0:
+                continue  # Already contracted from its other end
+            if first in self.adjacency and any(other == first and len(self.runs[edge]) == 2
+                                               for edge, other in self.adjacency[node]):
+                continue  # Adjacent nodes already joined by a direct edge
+            run = [node, first]
+            while run[-1] not in self.adjacency:
+                previous = run[-2]
+                run.append(next(cell for cell in neighbors(run[-1]) if cell != previous))
+            edge = len(self.runs)
+            self.runs.append(run)
+            for offset in range(1, len(run) - 1):
+                self.edge_of[run[offset]] = edge
+                self.offset_of[run[offset]] = offset
+            self.adjacency[node].append((edge, run[-1]))
+            if run[-1] != node:
+                self.adjacency[run[-1]].append((edge, node))
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.adjacency)
+
+    def _run_between(self, edge: int, from_offset: int, to_offset: int) -> List[int]:
+        """Return the cells of an edge's run from one offset to another, in travel order."""
+        run = self.runs[edge]
+        if from_offset <= to_offset:
+            return run[from_offset:to_offset + 1]
+        return run[to_offset:from_offset + 1][::-1]
+
+    def _attachments(self, cell_id: int) -> List[Tuple[int, int, List[int]]]:
+        """Return (node, moves, cells from cell_id to node) for the nodes a cell connects to directly."""
+        if cell_id in self.adjacency:
+            return [(cell_id, 0, [cell_id])]
+        edge, offset = self.edge_of[cell_id], self.offset_of[cell_id]
+        run = self.runs[edge]
+        last = len(run) - 1
+        return [(run[0], offset, self._run_between(edge, offset, 0)),
+                (run[last], last - offset, self._run_between(edge, offset, last))]
+
+    def shortest_path(self, starts: Iterable[int], goals: Iterable[int]) -> Optional[List[int]]:
+        """Return the cell ids of a shortest path from any start to the nearest goal, or None if none is reachable.
+
+        A* runs over the nodes only, with the grid Manhattan distance to the closest goal as the heuristic; starts
+        and goals inside corridors are attached to the nodes at both ends of their corridor."""
+        num_cols = self.maze.num_cols
+        goals = set(goals)
+        goal_positions = [divmod(goal, num_cols) for goal in goals]
+
+        def heuristic(cell_id: int) -> int:
+            i, j = divmod(cell_id, num_cols)
+            return min(abs(i - goal_i) + abs(j - goal_j) for goal_i, goal_j in goal_positions)
+
+        # Goals reachable from a node without passing another node: node -> [(moves, cells from node to goal)]
+        goal_exits: Dict[int, List[Tuple[int, List[int]]]] = {}
+        for goal in goals:
+            for node, moves, cells in self._attachments(goal):
+                goal_exits.setdefault(node, []).append((moves, cells[::-1]))
+
+        best: Optional[Tuple[int, List[int]]] = None  # (moves, full path) of the best complete route so far
+        distance: Dict[int, int] = {}
+        came_from: Dict[int, Tuple[Optional[int], List[int]]] = {}  # node -> (previous node, cells leading here)
+        open_heap = []
+        counter = 0
+        for start in starts:
+            if start in goals:
+                return [start]
+            if start not in self.adjacency:
+                # Start and goal on the same corridor can meet without reaching either end node.
+                edge, offset = self.edge_of[start], self.offset_of[start]
+                for goal in goals:
+                    if goal not in self.adjacency and self.edge_of[goal] == edge:
+                        moves = abs(offset - self.offset_of[goal])
+                        if best is None or moves < best[0]:
+                            best = (moves, self._run_between(edge, offset, self.offset_of[goal]))
+            for node, moves, cells in self._attachments(start):
+                if moves < distance.get(node, moves + 1):
+                    distance[node] = moves
+                    came_from[node] = (None, cells)
+                    counter += 1
+                    heapq.heappush(open_heap, (moves + heuristic(node), counter, node))
+
+        closed = set()
+        while open_heap:
+            f_score, _, node = heapq.heappop(open_heap)
+            if best is not None and f_score >= best[0]:
+                break
+            if node in closed:
+                continue
+            closed.add(node)
+            for moves, cells in goal_exits.get(node, ()):
+                if best is None or distance[node] + moves < best[0]:
+                    best = (distance[node] + moves, self._cells_to(node, came_from) + cells[1:])
+            for edge, other in self.adjacency[node]:
+                if other == node or other in closed:
+                    continue
+                tentative = distance[node] + len(self.runs[edge]) - 1
+                if tentative < distance.get(other, tentative + 1):
+                    distance[other] = tentative
+                    run = self.runs[edge]
+                    came_from[other] = (node, run if run[0] == node else run[::-1])
+                    counter += 1
+                    heapq.heappush(open_heap, (tentative + heuristic(other), counter, other))
+
+        return None if best is None else best[1]
+
+    @staticmethod
+    def _cells_to(node: int, came_from: Dict[int, Tuple[Optional[int], List[int]]]) -> List[int]:
+        """Expand the chain of edges that reached node into the cells walked, starting at the start cell."""
+        segments = []
+        while node is not None:
+            previous, cells = came_from[node]
+            segments.append(cells)
+            node = previous
+        path = list(segments.pop())
+        while segments:
+            path.extend(segments.pop()[1:])
+        return path
@@ -1,9 +1,33 @@
 """Maze generator and solver."""
 from models import Drawable, Cell
-from dataclasses import dataclass
+from grid import WallGrid, CellGrid, CellView
+from search import SearchWorkspace
+from tree_index import TreeIndex
+from junctions import JunctionGraph
+from hpa import HierarchicalPlanner
+from incremental import IncrementalPlanner
+from vectorized import bfs_distances
+from solvers import choose_solver, get_solver, path_steps
+from generators import GENERATORS
+from dataclasses import dataclass, field
 from tkinter import Canvas
-from typing import List, Tuple
+from array import array
+from itertools import permutations
+from numbers import Integral
+from typing import Iterable, Iterator, List, Set, Tuple, Union
 import random
+import threading
+
+# Directions in _neighbor_positions order: up, left, down, right.
+ROW_STEPS = (-1, 0, 1, 0)
+COL_STEPS = (0, -1, 0, 1)
+NEIGHBOR_ORDERS = list(permutations(range(4)))
+# A shuffled list of a cell's on-grid directions -> index in NEIGHBOR_ORDERS (off-grid directions appended) * 5
+NEIGHBOR_ORDER_CODES = {prefix: NEIGHBOR_ORDERS.index(prefix + tuple(d for d in range(4) if d not in prefix)) * 5
+                        for k in range(5) for prefix in permutations(range(4), k)}
+
+Step = Tuple[Cell, Cell, bool]
+Endpoints = Union[Cell, Tuple[int, int], Iterable[Union[Cell, Tuple[int, int]]]]
 
 class MazeFactory:
     """Creates and initializes cells for the maze."""
@@ -32,18 +56,40 @@ class Maze(Drawable):
     cell_size_y: int
     _cells: List[List[Cell]] = None
     seed: int = None
+    compact: bool = False
+    _workspaces: threading.local = field(default_factory=threading.local, init=False, repr=False, compare=False)
+    _revision: int = field(default=0, init=False, repr=False, compare=False)
+    _indexes: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    _costs: array = field(default=None, init=False, repr=False, compare=False)
+    _max_cost: int = field(default=1, init=False, repr=False, compare=False)
+    _min_cost: int = field(default=1, init=False, repr=False, compare=False)
 
     @property
     def cells(self) -> List[List[Cell]]:
-        """Lazy initialization of cells."""
+        """Lazy initialization of cells; compact mazes hand out views over a bit-packed WallGrid."""
         if self._cells is None:
-            self._cells = MazeFactory.create_cells(self.x1, self.y1, self.num_rows, self.num_cols, self.cell_size_x, self.cell_size_y)
+            if self.compact:
+                walls = WallGrid(self.num_rows, self.num_cols)
+                self._cells = CellGrid(walls, self.x1, self.y1, self.cell_size_x, self.cell_size_y)
+            else:
+                self._cells = MazeFactory.create_cells(self.x1, self.y1, self.num_rows, self.num_cols, self.cell_size_x, self.cell_size_y)
         return self._cells
     
     def __post_init__(self):
         if self.seed is not None:
             random.seed(self.seed)
 
+    def __getstate__(self):
+        """Drop the per-thread workspaces and cached indexes, which are rebuilt on demand, so mazes can be pickled and copied."""
+        state = self.__dict__.copy()
+        del state["_workspaces"], state["_indexes"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._workspaces = threading.local()
+        self._indexes = {}
+
     def draw(self, canvas: Canvas) -> None:
         """Draw the maze on the given canvas."""
         for row in self.cells:
@@ -59,189 +105,310 @@ class Maze(Drawable):
         exit.has_right_wall = False
         exit.has_bottom_wall = False
 
-    def _break_walls_r(self, cell: Cell, i: int, j: int):
-        """The recursive break_walls_r method is a breadth-first traversal through the cells, breaking down walls as it goes."""
-        cell.visited = True
-        neighbors, indices = self._get_neighbors(i, j)
-
-        # Shuffle the neighbors to introduce randomness
-        combined = random.sample(list(zip(neighbors, indices)), len(neighbors))
-        neighbors, indices = zip(*combined)
-
-        for idx, neighbor in enumerate(neighbors):
-            ni, nj = indices[idx]
-            if not neighbor.visited:
-                self._break_walls_between(cell, i, j, neighbor, ni, nj)
-                self._break_walls_r(neighbor, ni, nj)
-
-    def _get_neighbors(self, i: int, j: int):
-        """Get the neighboring cells of the current cell."""
-        neighbors = []
-        indices = []
+    def _break_walls_iterative(self, i: int, j: int):
+        """Carve passages with a recursive backtracker that keeps its own stack of cell ids instead of recursing.
+
+        Each cell's shuffled neighbor order and how many of them were tried are packed into one byte when it is entered."""
+        num_rows, num_cols = self.num_rows, self.num_cols
+        cells = self.cells
+        visited = bytearray(num_rows * num_cols)
+        progress = bytearray(num_rows * num_cols)  # Neighbor order * 5 + neighbors tried
+        visited[i * num_cols + j] = 1
+        progress[i * num_cols + j] = self._shuffled_neighbor_order(i, j)
+        stack = array("q", [i * num_cols + j])
+        while stack:
+            current = stack[-1]
+            ci, cj = divmod(current, num_cols)
+            order, tried = divmod(progress[current], 5)
+            while tried < 4:
+                direction = NEIGHBOR_ORDERS[order][tried]
+                tried += 1
+                ni, nj = ci + ROW_STEPS[direction], cj + COL_STEPS[direction]
+                if 0 <= ni < num_rows and 0 <= nj < num_cols and not visited[ni * num_cols + nj]:
+                    progress[current] = order * 5 + tried
+                    visited[ni * num_cols + nj] = 1
+                    self._break_walls_between(cells[ci][cj], ci, cj, cells[ni][nj], ni, nj)
+                    progress[ni * num_cols + nj] = self._shuffled_neighbor_order(ni, nj)
+                    stack.append(ni * num_cols + nj)
+                    break
+            else:
+                stack.pop()
+
+    def _shuffled_neighbor_order(self, i: int, j: int) -> int:
+        """Shuffle the neighbor directions of cell (i, j) and return their NEIGHBOR_ORDER_CODES entry.
+
+        random.sample draws the same numbers as in _shuffled_neighbor_positions, so seeded mazes do not change."""
+        if 0 < i < self.num_rows - 1 and 0 < j < self.num_cols - 1:
+            directions = [0, 1, 2, 3]
+        else:
+            directions = [direction for direction, on_grid in
+                          enumerate((i > 0, j > 0, i < self.num_rows - 1, j < self.num_cols - 1)) if on_grid]
+        return NEIGHBOR_ORDER_CODES[tuple(random.sample(directions, len(directions)))]
+
+    def _neighbor_positions(self, i: int, j: int) -> List[Tuple[int, int]]:
+        """Get the positions of the neighboring cells of the current cell."""
+        positions = []
         if i > 0:
-            neighbors.append(self.cells[i-1][j])
-            indices.append((i-1, j))
+            positions.append((i-1, j))
         if j > 0:
-            neighbors.append(self.cells[i][j-1])
-            indices.append((i, j-1))
+            positions.append((i, j-1))
         if i < self.num_rows - 1:
-            neighbors.append(self.cells[i+1][j])
-            indices.append((i+1, j))
+            positions.append((i+1, j))
         if j < self.num_cols - 1:
-            neighbors.append(self.cells[i][j+1])
-            indices.append((i, j+1))
-        return neighbors, indices
+            positions.append((i, j+1))
+        return positions
+
+    def _shuffled_neighbor_positions(self, i: int, j: int) -> List[Tuple[int, int]]:
+        """Get the neighbor positions of the current cell in random order."""
+        positions = self._neighbor_positions(i, j)
+        return random.sample(positions, len(positions))
 
     def _break_walls_between(self, cell1 : Cell, i1 : int, j1 : int, cell2 : Cell, i2 : int, j2 : int):
         """Break the walls between two adjacent cells. Determine which walls to break based on their relative positions."""
-        if i1 == i2:
+        self._set_walls_between(cell1, i1, j1, cell2, i2, j2, False)
+
+    def _add_walls_between(self, cell1 : Cell, i1 : int, j1 : int, cell2 : Cell, i2 : int, j2 : int):
+        """Put back the walls between two adjacent cells, the inverse of _break_walls_between."""
+        self._set_walls_between(cell1, i1, j1, cell2, i2, j2, True)
+
+    def _set_walls_between(self, cell1 : Cell, i1 : int, j1 : int, cell2 : Cell, i2 : int, j2 : int, present: bool):
+        """Add or remove the pair of walls separating two adjacent cells."""
+        self._revision += 1  # Invalidates indexes built from the previous walls
+        if self.compact:
+            walls = self.cells.walls
+            (walls.close_between if present else walls.open_between)(i1, j1, i2, j2)
+        elif i1 == i2:
             if j1 < j2:
-                cell1.has_right_wall = False
-                cell2.has_left_wall = False
+                cell1.has_right_wall = present
+                cell2.has_left_wall = present
             else:
-                cell1.has_left_wall = False
-                cell2.has_right_wall = False
+                cell1.has_left_wall = present
+                cell2.has_right_wall = present
         elif j1 == j2:
             if i1 < i2:
-                cell1.has_bottom_wall = False
-                cell2.has_top_wall = False
+                cell1.has_bottom_wall = present
+                cell2.has_top_wall = present
             else:
-                cell1.has_top_wall = False
-                cell2.has_bottom_wall = False
+                cell1.has_top_wall = present
+                cell2.has_bottom_wall = present
         else:
             raise Exception(f"Cells at ({i1}, {j1}) and ({i2}, {j2}) are not adjacent")
 
+    def set_cell_cost(self, cells: Endpoints, cost: int) -> None:
+        """Set the cost (a positive integer, 1 by default) of entering the given cell, position, or collection of either."""
+        if not isinstance(cost, Integral) or isinstance(cost, bool) or cost < 1:
+            raise ValueError(f"Cell cost must be a positive integer, got {cost!r}")
+        cost = int(cost)  # Also accepts NumPy integers
+        if self._costs is None:
+            self._costs = array("l", [1]) * (self.num_rows * self.num_cols)
+        for i, j in self._as_positions(cells):
+            self._costs[i * self.num_cols + j] = cost
+        self._max_cost = max(self._max_cost, cost)
+        self._min_cost = None  # Recomputed on demand; raising the cheapest cell can increase it
+
+    @property
+    def min_cell_cost(self) -> int:
+        """The smallest cost of entering any cell."""
+        if self._min_cost is None:
+            self._min_cost = min(self._costs)
+        return self._min_cost
+
+    def get_cell_cost(self, cell: Union[Cell, Tuple[int, int]]) -> int:
+        """Return the cost of entering the given cell or (row, col) position."""
+        (i, j), = self._as_positions(cell)
+        return 1 if self._costs is None else self._costs[i * self.num_cols + j]
+
     def _reset_cells_visited(self):
         """Reset the visited flag of all cells."""
+        if self.compact:
+            self.cells.reset_visited()
+            return
         for row in self.cells:
             for cell in row:
                 cell.visited = False
 
-    def generate(self):
-        """Generate the maze."""
-        self._break_entrance_and_exit()
-        self._break_walls_r(self.cells[0][0], 0, 0)
-        self._reset_cells_visited()
-
-    def solve(self, algorithm : str = "dfs") -> List[Tuple[Cell, Cell]]:
-        """Compute a solution to the maze and return a list of steps."""
-        steps = []
-        if algorithm == "dfs":
-            self._solve_r(self.cells[0][0], 0, 0, steps)
-        elif algorithm == "a_star":
-            start = self.cells[0][0]
-            end = self.cells[self.num_rows - 1][self.num_cols - 1]
-            steps = self.a_star_search(start, end)
-        else:
+    def generate(self, algorithm: str = "backtracker"):
+        """Generate the maze with the algorithm registered under the given name in generators.GENERATORS."""
+        if algorithm not in GENERATORS:
             raise ValueError(f"Unknown algorithm: {algorithm}")
-        return steps
-
-    def _solve_r(self, cell : Cell, i : int, j : int, steps: List[Tuple[Cell, Cell, bool]]):
-        """A depth-first solution to the maze.
-        The _solve_r method returns True if the current cell is an end cell, OR if it leads to the end cell.
-        It returns False if the current cell is a loser cell."""
-        cell.visited = True
-
-        if i == self.num_rows - 1 and j == self.num_cols - 1:
-            return True
-
-        neighbors, indices = self._get_neighbors(i, j)
-
-        combined = random.sample(list(zip(neighbors, indices)), len(neighbors))
-        neighbors, indices = zip(*combined)
-
-        for idx, neighbor in enumerate(neighbors):
-            ni, nj = indices[idx]
-            if not neighbor.visited:
-                if (i == ni and j < nj and not cell.has_right_wall) or \
-                (i == ni and j > nj and not cell.has_left_wall) or \
-                (j == nj and i < ni and not cell.has_bottom_wall) or \
-                (j == nj and i > ni and not cell.has_top_wall):
-
-                    steps.append((cell, neighbor, False))  # False indicates it's not an undo step
-
-                    if self._solve_r(neighbor, ni, nj, steps):
-                        return True
-
-                    steps.append((cell, neighbor, True))  # True indicates it's an undo step
-
-        return False
+        self._break_entrance_and_exit()
+        GENERATORS[algorithm](self)
+
+    def solve(self, algorithm : str = "dfs", stream: bool = False, start: Endpoints = None, goal: Endpoints = None,
+              heuristic: str = "manhattan") -> Union[List[Step], Iterator[Step]]:
+        """Compute a solution to the maze and return a list of steps, or a lazy iterator of them if stream is True.
+
+        algorithm names an engine in solvers.SOLVERS or is "auto"; start and goal default to the entrance and exit.
+        The a_star and dijkstra engines leave the number of cells they expanded in self.workspace().expanded."""
+        starts = [i * self.num_cols + j for i, j in self._as_positions((0, 0) if start is None else start)]
+        goals = self._as_positions((self.num_rows - 1, self.num_cols - 1) if goal is None else goal)
+        goal_ids = {i * self.num_cols + j for i, j in goals}
+        if algorithm == "auto":
+            algorithm = choose_solver(self, starts, goal_ids)
+        engine = get_solver(algorithm)
+        steps = self._cell_steps(engine.steps(self, starts, goal_ids, heuristic=heuristic))
+        return steps if stream else list(steps)
+
+    def _has_index(self, index_type) -> bool:
+        """Return True if an index of the given type is already built for the current walls."""
+        cached = self._indexes.get(index_type)
+        return cached is not None and cached[0] == self._revision
+
+    def _cached_index(self, index_type):
+        """Return an index of the given type built from the current walls, building it on first use and again after walls are broken."""
+        cached = self._indexes.get(index_type)
+        if cached is None or cached[0] != self._revision:
+            cached = self._indexes[index_type] = (self._revision, index_type(self))
+        return cached[1]
+
+    def tree_index(self) -> TreeIndex:
+        """Return the TreeIndex of this perfect maze."""
+        return self._cached_index(TreeIndex)
+
+    def junction_graph(self) -> JunctionGraph:
+        """Return the JunctionGraph of this maze."""
+        return self._cached_index(JunctionGraph)
+
+    def hpa_planner(self) -> HierarchicalPlanner:
+        """Return the HierarchicalPlanner of this maze; its refined-path cache is kept until walls change."""
+        return self._cached_index(HierarchicalPlanner)
+
+    def incremental_planner(self, start: Union[Cell, Tuple[int, int]] = None, goal: Endpoints = None) -> IncrementalPlanner:
+        """Return an IncrementalPlanner from start to the nearest goal (the entrance and exit by default)."""
+        (i, j), = self._as_positions((0, 0) if start is None else start)
+        goals = self._as_positions((self.num_rows - 1, self.num_cols - 1) if goal is None else goal)
+        return IncrementalPlanner(self, i * self.num_cols + j, [gi * self.num_cols + gj for gi, gj in goals])
+
+    def distance_grid(self, start: Endpoints = None):
+        """Return a NumPy (num_rows, num_cols) array of move counts from start (the entrance by default), -1 where unreachable."""
+        starts = self._as_positions((0, 0) if start is None else start)
+        return bfs_distances(self, [i * self.num_cols + j for i, j in starts])
+
+    def _as_positions(self, endpoints: Endpoints) -> List[Tuple[int, int]]:
+        """Normalise a cell, a (row, col) position, or a collection of either into a list of positions."""
+        if isinstance(endpoints, (Cell, CellView)):
+            return [self.get_cell_position(endpoints)]
+        if isinstance(endpoints, tuple) and len(endpoints) == 2 and all(isinstance(k, Integral) for k in endpoints):
+            i, j = int(endpoints[0]), int(endpoints[1])  # Also accepts NumPy integers
+            if not (0 <= i < self.num_rows and 0 <= j < self.num_cols):
+                raise ValueError(f"Position {endpoints} is outside the maze")
+            return [(i, j)]
+        if not isinstance(endpoints, Iterable) or isinstance(endpoints, (str, bytes)):
+            raise ValueError(f"Expected a cell, a (row, col) position or a collection of them, got {endpoints!r}")
+        positions = [position for item in endpoints for position in self._as_positions(item)]
+        if not positions:
+            raise ValueError("At least one endpoint is required")
+        return positions
+
+    def _solve_iterative(self, starts: List[Tuple[int, int]], goals: Set[int]) -> Iterator[Tuple[int, int, bool]]:
+        """A depth-first solution to the maze that yields its steps as it goes, with backtracks as undo steps.
+
+        Like _break_walls_iterative it keeps a stack of cell ids and one progress byte per cell, so it needs no
+        recursion and no reset of the cells."""
+        cells = self.cells
+        num_rows, num_cols = self.num_rows, self.num_cols
+        visited = bytearray(num_rows * num_cols)
+        progress = bytearray(num_rows * num_cols)  # Neighbor order * 5 + neighbors tried
+        for i, j in starts:
+            if visited[i * num_cols + j]:
+                continue  # Already explored from an earlier start
+            visited[i * num_cols + j] = 1
+            if i * num_cols + j in goals:
+                return
+
+            progress[i * num_cols + j] = self._shuffled_neighbor_order(i, j)
+            stack = array("q", [i * num_cols + j])
+            while stack:
+                current = stack[-1]
+                ci, cj = divmod(current, num_cols)
+                cell = cells[ci][cj]
+                order, tried = divmod(progress[current], 5)
+                while tried < 4:
+                    direction = NEIGHBOR_ORDERS[order][tried]
+                    tried += 1
+                    ni, nj = ci + ROW_STEPS[direction], cj + COL_STEPS[direction]
+                    if 0 <= ni < num_rows and 0 <= nj < num_cols and not visited[ni * num_cols + nj] and \
+                            self._is_open_towards(cell, ci, cj, ni, nj):
+                        progress[current] = order * 5 + tried
+                        yield (current, ni * num_cols + nj, False)  # False indicates it's not an undo step
+                        visited[ni * num_cols + nj] = 1
+                        if ni * num_cols + nj in goals:
+                            return
+                        progress[ni * num_cols + nj] = self._shuffled_neighbor_order(ni, nj)
+                        stack.append(ni * num_cols + nj)
+                        break
+                else:
+                    stack.pop()
+                    if stack:
+                        yield (stack[-1], current, True)  # True indicates it's an undo step
+
+    def _is_open_towards(self, cell: Cell, i: int, j: int, ni: int, nj: int) -> bool:
+        """Return True if cell (i, j) has no wall on the side facing the adjacent cell (ni, nj)."""
+        return (i == ni and j < nj and not cell.has_right_wall) or \
+            (i == ni and j > nj and not cell.has_left_wall) or \
+            (j == nj and i < ni and not cell.has_bottom_wall) or \
+            (j == nj and i > ni and not cell.has_top_wall)
 
     def manhattan_distance(self, cell1, cell2):
-        return abs(cell1.x1 - cell2.x1) + abs(cell1.y1 - cell2.y1)
-
-    def reconstruct_path(self, came_from, current):
-        path = [current]
-        while current in came_from:
-            current = came_from[current]
-            path.append(current)
-        path.reverse()
+        """Return the number of moves between two cells if there were no walls, independent of the cell size."""
+        (i1, j1), (i2, j2) = self.get_cell_position(cell1), self.get_cell_position(cell2)
+        return abs(i1 - i2) + abs(j1 - j2)
 
-        # Convert the list of cells to the expected format
-        solution_steps = []
-        for i in range(len(path) - 1):
-            solution_steps.append((path[i], path[i + 1], False))
-        return solution_steps
+    def _cell_steps(self, id_steps: Iterable[Tuple[int, int, bool]]) -> Iterator[Step]:
+        """Convert (from_id, to_id, undo) steps into the (Cell, Cell, undo) steps returned by solve."""
+        for from_id, to_id, is_undo in id_steps:
+            yield (self.get_cell_by_id(from_id), self.get_cell_by_id(to_id), is_undo)
 
     def get_cell_position(self, cell: Cell) -> Tuple[int, int]:
-        """Return the row and column indices of a given cell."""
-        for i, row in enumerate(self.cells):
-            for j, current_cell in enumerate(row):
-                if current_cell == cell:
-                    return i, j
-        raise ValueError("Cell not found in the maze.")
-
-    def _get_valid_neighbors(self, i: int, j: int, current_cell: Cell):
-        """Get the neighboring cells of the current cell that can be reached without crossing a wall."""
-        neighbors = []
-        indices = []
+        """Return the row and column indices of a given cell, computed from its coordinates in O(1)."""
+        i, y_offset = divmod(cell.y1 - self.y1, self.cell_size_y)
+        j, x_offset = divmod(cell.x1 - self.x1, self.cell_size_x)
+        if x_offset or y_offset or not (0 <= i < self.num_rows and 0 <= j < self.num_cols):
+            raise ValueError("Cell not found in the maze.")
+        if cell.x2 != cell.x1 + self.cell_size_x or cell.y2 != cell.y1 + self.cell_size_y:
+            raise ValueError("Cell not found in the maze.")
+        return i, j
+
+    def get_cell_id(self, cell: Cell) -> int:
+        """Return the row-major id (row * num_cols + col) of a given cell; the search and index modules use these ids."""
+        i, j = self.get_cell_position(cell)
+        return i * self.num_cols + j
+
+    def get_cell_by_id(self, cell_id: int) -> Cell:
+        """Return the cell with the given id."""
+        if not 0 <= cell_id < self.num_rows * self.num_cols:
+            raise ValueError(f"Cell id {cell_id} is out of range")
+        i, j = divmod(cell_id, self.num_cols)
+        return self.cells[i][j]
+
+    def _open_neighbor_positions(self, i: int, j: int) -> List[Tuple[int, int]]:
+        """Get the positions of the neighboring cells that can be reached from cell (i, j) without crossing a wall."""
+        if self.compact:
+            return self.cells.walls.open_neighbors(i, j)
+        current_cell = self.cells[i][j]
+        positions = []
         if i > 0 and not current_cell.has_top_wall:
-            neighbors.append(self.cells[i-1][j])
-            indices.append((i-1, j))
+            positions.append((i-1, j))
         if j > 0 and not current_cell.has_left_wall:
-            neighbors.append(self.cells[i][j-1])
-            indices.append((i, j-1))
+            positions.append((i, j-1))
         if i < self.num_rows - 1 and not current_cell.has_bottom_wall:
-            neighbors.append(self.cells[i+1][j])
-            indices.append((i+1, j))
+            positions.append((i+1, j))
         if j < self.num_cols - 1 and not current_cell.has_right_wall:
-            neighbors.append(self.cells[i][j+1])
-            indices.append((i, j+1))
-        return neighbors, indices
-
-    def a_star_search(self, start, end):
-        open_set = [start]
-        closed_set = []
-        came_from = {}
-
-        g = {cell: float('inf') for row in self.cells for cell in row}
-        g[start] = 0
-
-        f = {cell: float('inf') for row in self.cells for cell in row}
-        f[start] = self.manhattan_distance(start, end)
-
-        while open_set:
-            current = min(open_set, key=lambda x: f[x])
-            if current == end:
-                return self.reconstruct_path(came_from, current)
-
-            open_set.remove(current)
-            closed_set.append(current)
-
-            i, j = self.get_cell_position(current)
-            neighbors, _ = self._get_valid_neighbors(i, j, current)  # Unpack neighbors and their indices
-            for neighbor in neighbors:  # Use only the Cell objects for the A* logic
-                if neighbor in closed_set:
-                    continue
-                tentative_g_score = g[current] + 1
-
-                if neighbor not in open_set:
-                    open_set.append(neighbor)
-                elif tentative_g_score >= g[neighbor]:
-                    continue
-
-                came_from[neighbor] = current
-                g[neighbor] = tentative_g_score
-                f[neighbor] = g[neighbor] + self.manhattan_distance(neighbor, end)
-
-        return []
+            positions.append((i, j+1))
+        return positions
+
+    def workspace(self) -> SearchWorkspace:
+        """Return the calling thread's reusable SearchWorkspace for this maze, creating it on first use."""
+        workspace = getattr(self._workspaces, "workspace", None)
+        if workspace is None:
+            workspace = self._workspaces.workspace = SearchWorkspace(self)
+        return workspace
+
+    def a_star_search(self, start, end, workspace: SearchWorkspace = None, heuristic: str = "manhattan"):
+        """A* search from start to end. Returns the path as a list of steps, or an empty list if there is none.
+
+        The workspace (the calling thread's own by default) holds SearchWorkspace.nbytes; see bounded.py for leaner solvers."""
+        if workspace is None:
+            workspace = self.workspace()
+        path = workspace.a_star([self.get_cell_id(start)], [self.get_cell_id(end)], heuristic)
+        return list(self._cell_steps(path_steps(path)))
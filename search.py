@@ -0,0 +1,283 @@
+"""Reusable search state for answering many path queries on the same maze."""
+from array import array
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+import heapq
+
+HeuristicFactory = Callable[[object, Set[int]], Callable[[int], int]]
+
+MAX_BUCKET_COST = 256  # Above this cell cost the buckets cost more to allocate and skip than a binary heap
+
+
+def manhattan_heuristic(maze, goals: Set[int]) -> Callable[[int], int]:
+    """Moves to the closest goal ignoring walls, in grid units. Admissible while every cell costs at least 1."""
+    num_cols = maze.num_cols
+    goal_positions = [divmod(goal, num_cols) for goal in goals]
+    if len(goal_positions) == 1:
+        (goal_i, goal_j), = goal_positions
+
+        def estimate(cell_id: int) -> int:
+            i, j = divmod(cell_id, num_cols)
+            return abs(i - goal_i) + abs(j - goal_j)
+        return estimate
+
+    def estimate(cell_id: int) -> int:
+        i, j = divmod(cell_id, num_cols)
+        return min(abs(i - goal_i) + abs(j - goal_j) for goal_i, goal_j in goal_positions)
+    return estimate
+
+
+def scaled_manhattan_heuristic(maze, goals: Set[int]) -> Callable[[int], int]:
+    """Manhattan distance times the cheapest cell cost, the tightest admissible Manhattan bound on weighted mazes."""
+    manhattan = manhattan_heuristic(maze, goals)
+    scale = maze.min_cell_cost
+    if scale == 1:
+        return manhattan
+    return lambda cell_id: manhattan(cell_id) * scale
+
+
+def zero_heuristic(maze, goals: Set[int]) -> Callable[[int], int]:
+    """No estimate at all, which turns A* into Dijkstra's algorithm."""
+    return lambda cell_id: 0
+
+
+HEURISTICS: Dict[str, HeuristicFactory] = {
+    "manhattan": manhattan_heuristic,
+    "scaled": scaled_manhattan_heuristic,
+    "zero": zero_heuristic,
+}
+
+
+def resolve_heuristic(heuristic: Union[str, HeuristicFactory]) -> HeuristicFactory:
+    """Return the factory for a heuristic given by name in HEURISTICS, or the factory itself."""
+    if isinstance(heuristic, str):
+        if heuristic not in HEURISTICS:
+            raise ValueError(f"Unknown heuristic: {heuristic}")
+        return HEURISTICS[heuristic]
+    return heuristic
+
+class SearchWorkspace:
+    """Flat per-cell scratch arrays for path searches on one maze, reset lazily with an epoch counter.
+
+    Every query starts a new epoch. A cell's g-score and parent are only meaningful while its seen stamp equals
+    the current epoch, and it is closed while its closed stamp does, so starting a query is O(1) and a query only
+    touches the cells it explores. Cells are addressed by id (see Maze.get_cell_id).
+
+    A workspace holds the state of one search at a time; use one workspace per thread."""
+
+    def __init__(self, maze) -> None:
+        self.maze = maze
+        size = maze.num_rows * maze.num_cols
+        self.epoch = 0
+        self.seen = array("I", [0]) * size
+        self.closed = array("I", [0]) * size
+        self.g = array("q", [0]) * size
+        self.parent = array("q", [0]) * size
+        self.expanded = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the per-cell arrays."""
+        return sum(len(arr) * arr.itemsize for arr in (self.seen, self.closed, self.g, self.parent))
+
+    def _begin(self) -> int:
+        """Start a new query and return its epoch."""
+        self.epoch += 1
+        if self.epoch == 1 << (8 * self.seen.itemsize):  # The stamps would wrap; clear them once and start over
+            size = len(self.seen)
+            self.seen = array("I", [0]) * size
+            self.closed = array("I", [0]) * size
+            self.epoch = 1
+        self.expanded = 0
+        return self.epoch
+
+    def path_to(self, cell_id: int) -> List[int]:
+        """Return the ids from the start of the last query to cell_id, following parent links."""
+        path = [cell_id]
+        while self.parent[cell_id] >= 0:
+            cell_id = self.parent[cell_id]
+            path.append(cell_id)
+        path.reverse()
+        return path
+
+    def a_star(self, starts: Iterable[int], goals: Iterable[int], heuristic: Union[str, HeuristicFactory] = "manhattan") -> Optional[List[int]]:
+        """Return the cell ids of a cheapest path from any start to the nearest goal, or None if no goal is reachable.
+
+        heuristic is the name of an entry in HEURISTICS or a factory with the same signature. The open set is a
+        binary heap with lazy deletion: an improved cell is pushed again and stale entries are skipped when popped,
+        so every open-set operation is O(log n). Ties on f are broken towards the larger g, i.e. the cell closest
+        to a goal, and then by insertion order, so runs are deterministic and plateaus are not explored broadly.
+        The number of cells expanded is left in self.expanded."""
+        maze = self.maze
+        num_cols = maze.num_cols
+        seen, closed, g, parent = self.seen, self.closed, self.g, self.parent
+        costs = maze._costs
+        epoch = self._begin()
+
+        goal_set = set(goals)
+        estimate = resolve_heuristic(heuristic)(maze, goal_set)
+
+        counter = 0  # Insertion order, keeps heap entries comparable on equal f
+        open_heap = []
+        for start in starts:
+            if seen[start] != epoch:
+                seen[start] = epoch
+                g[start] = 0
+                parent[start] = -1
+                counter += 1
+                open_heap.append((estimate(start), 0, counter, start))
+        heapq.heapify(open_heap)
+
+        while open_heap:
+            _, _, _, current = heapq.heappop(open_heap)
+            if closed[current] == epoch:
+                continue  # Stale entry for a cell that was already expanded
+            if current in goal_set:
+                return self.path_to(current)
+            closed[current] = epoch
+            self.expanded += 1
+
+            i, j = divmod(current, num_cols)
+            for ni, nj in maze._open_neighbor_positions(i, j):
+                neighbor = ni * num_cols + nj
+                if closed[neighbor] == epoch:
+                    continue
+                tentative_g_score = g[current] + (costs[neighbor] if costs else 1)
+                if seen[neighbor] == epoch and tentative_g_score >= g[neighbor]:
+                    continue
+
+                seen[neighbor] = epoch
+                g[neighbor] = tentative_g_score
+                parent[neighbor] = current
+                counter += 1
+                heapq.heappush(open_heap, (tentative_g_score + estimate(neighbor), -tentative_g_score, counter, neighbor))
+
+        return None
+
+    def dijkstra(self, starts: Iterable[int], goals: Iterable[int]) -> Optional[List[int]]:
+        """Return the cell ids of a cheapest path from any start to the nearest goal, or None if no goal is reachable.
+
+        Entering a cell costs its traversal cost (see Maze.set_cell_cost). While no cost exceeds MAX_BUCKET_COST
+        the open set is a BucketQueue; otherwise this is A* with the zero heuristic, i.e. Dijkstra on a binary heap."""
+        maze = self.maze
+        if maze._max_cost > MAX_BUCKET_COST:
+            return self.a_star(starts, goals, "zero")
+        num_cols = maze.num_cols
+        seen, closed, g, parent = self.seen, self.closed, self.g, self.parent
+        costs = maze._costs
+        epoch = self._begin()
+
+        goal_set = set(goals)
+        open_queue = BucketQueue(maze._max_cost)
+        for start in starts:
+            if seen[start] != epoch:
+                seen[start] = epoch
+                g[start] = 0
+                parent[start] = -1
+                open_queue.push(0, start)
+
+        while open_queue:
+            distance, current = open_queue.pop()
+            if closed[current] == epoch or distance > g[current]:
+                continue  # Stale entry for a cell that was already expanded or improved
+            if current in goal_set:
+                return self.path_to(current)
+            closed[current] = epoch
+            self.expanded += 1
+
+            i, j = divmod(current, num_cols)
+            for ni, nj in maze._open_neighbor_positions(i, j):
+                neighbor = ni * num_cols + nj
+                if closed[neighbor] == epoch:
+                    continue
+                tentative_g_score = distance + (costs[neighbor] if costs else 1)
+                if seen[neighbor] == epoch and tentative_g_score >= g[neighbor]:
+                    continue
+                seen[neighbor] = epoch
+                g[neighbor] = tentative_g_score
+                parent[neighbor] = current
+                open_queue.push(tentative_g_score, neighbor)
+
+        return None
+
+
+class BucketQueue:
+    """Monotone priority queue for integer priorities that grow by at most max_step at a time (Dial's buckets).
+
+    Every pushed priority must lie between the last popped priority and that plus max_step, which holds for
+    Dijkstra with integer edge weights up to max_step. The buckets are reused cyclically, so push is O(1) and pop
+    is O(1) plus the number of empty priorities skipped."""
+
+    def __init__(self, max_step: int) -> None:
+        self._buckets: List[List[int]] = [[] for _ in range(max_step + 1)]
+        self._current = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, priority: int, item: int) -> None:
+        """Add item with the given priority."""
+        self._buckets[priority % len(self._buckets)].append(item)
+        self._size += 1
+
+    def pop(self) -> Tuple[int, int]:
+        """Remove and return (priority, item) for an item with the smallest priority."""
+        if not self._size:
+            raise IndexError("pop from an empty BucketQueue")
+        while not self._buckets[self._current % len(self._buckets)]:
+            self._current += 1
+        self._size -= 1
+        return self._current, self._buckets[self._current % len(self._buckets)].pop()
+
+
+def bidirectional_bfs(maze, starts: Iterable[int], goals: Iterable[int]) -> Iterator[Tuple[int, int, bool]]:
+    """Breadth-first search from the starts and the goals at once, meeting in the middle.
+
+    Each round expands one whole layer of whichever frontier is smaller. Every edge explored by either side is
+    yielded as an undo step (from_id, to_id, True) when it is discovered, so both frontiers can be drawn as they
+    grow; once the two searches meet, the shortest path is yielded as forward steps (from_id, to_id, False).
+    The round in which the frontiers first touch is finished before choosing the meeting edge, which keeps the
+    path shortest. Yields nothing more if no goal is reachable."""
+    num_cols = maze.num_cols
+    forward = {start: (None, 0) for start in starts}  # cell id -> (parent id, distance)
+    backward = {goal: (None, 0) for goal in goals}
+    if any(start in backward for start in forward):
+        return
+    forward_frontier, backward_frontier = list(forward), list(backward)
+
+    best = None  # (length, forward-side id, backward-side id)
+    while forward_frontier and backward_frontier and best is None:
+        expand_forward = len(forward_frontier) <= len(backward_frontier)
+        this, other = (forward, backward) if expand_forward else (backward, forward)
+        frontier = forward_frontier if expand_forward else backward_frontier
+        next_frontier = []
+        for current in frontier:
+            distance = this[current][1] + 1
+            i, j = divmod(current, num_cols)
+            for ni, nj in maze._open_neighbor_positions(i, j):
+                neighbor = ni * num_cols + nj
+                if neighbor in other:
+                    length = distance + other[neighbor][1]
+                    if best is None or length < best[0]:
+                        best = (length, current, neighbor) if expand_forward else (length, neighbor, current)
+                if neighbor not in this:
+                    this[neighbor] = (current, distance)
+                    next_frontier.append(neighbor)
+                    yield (current, neighbor, True)
+        if expand_forward:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
+
+    if best is None:
+        return
+    _, forward_end, backward_end = best
+    path = [forward_end]
+    while forward[path[-1]][0] is not None:
+        path.append(forward[path[-1]][0])
+    path.reverse()
+    path.append(backward_end)
+    while backward[path[-1]][0] is not None:
+        path.append(backward[path[-1]][0])
+    for k in range(len(path) - 1):
+        yield (path[k], path[k + 1], False)
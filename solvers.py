@@ -0,0 +1,214 @@
+"""Registry of the solver engines behind Maze.solve."""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Type
+
+from bounded import ida_star, wall_follower
+from hpa import HierarchicalPlanner
+from junctions import JunctionGraph
+from search import MAX_BUCKET_COST, bidirectional_bfs
+from tree_index import TreeIndex
+import vectorized
+
+IdStep = Tuple[int, int, bool]
+
+MANY_GOALS = 8  # Above this many goals the per-cell multi-goal heuristic stops paying for itself
+
+@dataclass(frozen=True)
+class Capabilities:
+    """What a solver engine guarantees; choose_solver picks auto mode's engine from these alone."""
+    optimal: bool = False  # Returns a shortest path (cheapest if weighted)
+    streaming: bool = False  # Yields steps while it is still searching, exploration included as undo steps
+    weighted: bool = False  # Honours the maze's cell costs
+    parallel: bool = False  # Safe to run from several threads on the same maze at once
+    requires_numpy: bool = False
+    perfect_only: bool = False  # Only works on mazes without loops
+    index: Optional[type] = None  # Maze index it answers from (see Maze._cached_index)
+    multi_goal: bool = False  # Its work does not grow with the number of goals
+    goal_directed: bool = False  # Guided towards the goals by a heuristic
+    low_memory: bool = False  # Gives up speed to keep no per-cell state
+    max_cost: Optional[int] = None  # Largest cell cost it handles efficiently
+
+
+class SolverEngine(ABC):
+    """A path-finding algorithm that Maze.solve can dispatch to by name.
+
+    Engines work on cell ids (see Maze.get_cell_id) and yield (from_id, to_id, undo) steps; Maze.solve
+    turns them into cells. Forward steps that are not undone must form the returned path."""
+    name: str = ""
+    capabilities: Capabilities = Capabilities()
+
+    @abstractmethod
+    def steps(self, maze, starts: List[int], goals: Set[int], **options) -> Iterator[IdStep]:
+        """Yield the steps of a search from any of starts to one of goals."""
+
+
+SOLVERS: Dict[str, Type[SolverEngine]] = {}
+
+
+def register_solver(engine_class: Type[SolverEngine]) -> Type[SolverEngine]:
+    """Class decorator that makes an engine available to Maze.solve under its name."""
+    if not engine_class.name or engine_class.name == "auto":
+        raise ValueError(f"Invalid solver name: {engine_class.name!r}")
+    SOLVERS[engine_class.name] = engine_class
+    return engine_class
+
+
+def get_solver(name: str) -> SolverEngine:
+    """Return an instance of the engine registered under name."""
+    if name not in SOLVERS:
+        raise ValueError(f"Unknown algorithm: {name}")
+    return SOLVERS[name]()
+
+
+def path_steps(path: Optional[List[int]]) -> Iterator[IdStep]:
+    """Yield a path of cell ids as forward steps; yields nothing for None."""
+    if path is not None:
+        for k in range(len(path) - 1):
+            yield (path[k], path[k + 1], False)
+
+
+def choose_solver(maze, starts: List[int], goals: Set[int]) -> str:
+    """Pick the registered engine expected to answer this query fastest, judging by its capabilities alone.
+
+    Only optimal, non-streaming engines that can handle the maze are considered, so auto mode always returns
+    the path as forward steps. An engine with an index is only considered once that index is built for the
+    current walls, since building one costs more than a single search; it is then preferred, because it answers
+    without touching most cells, and the most specialised (perfect_only) index first. Queries with more than
+    MANY_GOALS goals then prefer multi-goal engines; otherwise goal-directed ones, unless they trade speed for
+    memory. NumPy engines win the remaining ties, then registration order."""
+    weighted = maze._costs is not None and maze._max_cost > 1
+    many_goals = len(goals) > MANY_GOALS
+
+    def usable(capabilities: Capabilities) -> bool:
+        if not capabilities.optimal or capabilities.streaming or (weighted and not capabilities.weighted):
+            return False
+        if capabilities.requires_numpy and vectorized.np is None:
+            return False
+        if capabilities.max_cost is not None and maze._max_cost > capabilities.max_cost:
+            return False
+        if capabilities.index is not None:
+            return maze._has_index(capabilities.index)
+        return not capabilities.perfect_only  # Nothing has checked the maze for loops
+
+    def rank(capabilities: Capabilities) -> Tuple[bool, ...]:
+        return (capabilities.index is None, not capabilities.perfect_only,
+                not (many_goals and capabilities.multi_goal), not capabilities.goal_directed,
+                capabilities.low_memory, not capabilities.requires_numpy)
+
+    candidates = [engine for engine in SOLVERS.values() if usable(engine.capabilities)]
+    if not candidates:
+        raise ValueError("No registered solver can answer this query")
+    return min(candidates, key=lambda engine: rank(engine.capabilities)).name
+
+
+@register_solver
+class DepthFirstSolver(SolverEngine):
+    """Randomised depth-first search with an explicit stack; shows its backtracking as undo steps."""
+    name = "dfs"
+    capabilities = Capabilities(streaming=True, parallel=True)
+
+    def steps(self, maze, starts, goals, **options):
+        return maze._solve_iterative([divmod(start, maze.num_cols) for start in starts], goals)
+
+
+@register_solver
+class AStarSolver(SolverEngine):
+    """A* on the calling thread's SearchWorkspace; accepts a heuristic option."""
+    name = "a_star"
+    capabilities = Capabilities(optimal=True, weighted=True, parallel=True, goal_directed=True)
+
+    def steps(self, maze, starts, goals, heuristic="manhattan", **options):
+        yield from path_steps(maze.workspace().a_star(starts, goals, heuristic))
+
+
+@register_solver
+class DijkstraSolver(SolverEngine):
+    """Dijkstra with a bucket queue on the calling thread's SearchWorkspace."""
+    name = "dijkstra"
+    capabilities = Capabilities(optimal=True, weighted=True, parallel=True, multi_goal=True, max_cost=MAX_BUCKET_COST)
+
+    def steps(self, maze, starts, goals, **options):
+        yield from path_steps(maze.workspace().dijkstra(starts, goals))
+
+
+@register_solver
+class BidirectionalSolver(SolverEngine):
+    """Breadth-first search from both ends; explored edges are yielded as undo steps."""
+    name = "bidirectional"
+    capabilities = Capabilities(optimal=True, streaming=True, parallel=True, multi_goal=True)
+
+    def steps(self, maze, starts, goals, **options):
+        return bidirectional_bfs(maze, starts, goals)
+
+
+@register_solver
+class WavefrontSolver(SolverEngine):
+    """NumPy breadth-first wavefront."""
+    name = "bfs"
+    capabilities = Capabilities(optimal=True, parallel=True, requires_numpy=True, multi_goal=True)
+
+    def steps(self, maze, starts, goals, **options):
+        yield from path_steps(vectorized.bfs_path(maze, starts, goals))
+
+
+@register_solver
+class DeadEndFillingSolver(SolverEngine):
+    """Vectorised dead-end filling followed by a search of the surviving cells."""
+    name = "dead_end_filling"
+    capabilities = Capabilities(optimal=True, parallel=True, requires_numpy=True)
+
+    def steps(self, maze, starts, goals, **options):
+        yield from path_steps(vectorized.dead_end_path(maze, starts, goals))
+
+
+@register_solver
+class JunctionSolver(SolverEngine):
+    """A* over the maze's cached junction graph."""
+    name = "junction"
+    capabilities = Capabilities(optimal=True, parallel=True, index=JunctionGraph)
+
+    def steps(self, maze, starts, goals, **options):
+        yield from path_steps(maze.junction_graph().shortest_path(starts, goals))
+
+
+@register_solver
+class HierarchicalSolver(SolverEngine):
+    """Hierarchical A* over the maze's cached cluster-entrance graph."""
+    name = "hpa"
+    capabilities = Capabilities(optimal=True, parallel=True, index=HierarchicalPlanner)
+
+    def steps(self, maze, starts, goals, **options):
+        yield from path_steps(maze.hpa_planner().shortest_path(starts, goals))
+
+
+@register_solver
+class TreeSolver(SolverEngine):
+    """Reads the unique path between the closest start and goal from the maze's cached tree index."""
+    name = "tree"
+    capabilities = Capabilities(optimal=True, parallel=True, perfect_only=True, index=TreeIndex)
+
+    def steps(self, maze, starts, goals, **options):
+        index = maze.tree_index()
+        start, goal = min(((start, goal) for start in starts for goal in goals), key=lambda pair: index.distance(*pair))
+        yield from path_steps(index.path(start, goal))
+
+
+@register_solver
+class WallFollowerSolver(SolverEngine):
+    """Right-hand wall follower; its memory is one byte per cell of the current path."""
+    name = "wall_follower"
+    capabilities = Capabilities(streaming=True, parallel=True, low_memory=True)
+
+    def steps(self, maze, starts, goals, **options):
+        return wall_follower(maze, starts, goals)
+
+
+@register_solver
+class IterativeDeepeningSolver(SolverEngine):
+    """IDA*; its memory grows with the path length instead of the maze size. Accepts a heuristic option."""
+    name = "ida_star"
+    capabilities = Capabilities(optimal=True, weighted=True, parallel=True, goal_directed=True, low_memory=True)
+
+    def steps(self, maze, starts, goals, heuristic="manhattan", **options):
+        yield from path_steps(ida_star(maze, starts, goals, heuristic))
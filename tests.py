@@ -1,5 +1,35 @@
+import copy
+import pickle
+import random
+import sys
+import threading
+import tracemalloc
 import unittest
 from maze import Maze
+from models import Cell
+from search import HEURISTICS, BucketQueue, SearchWorkspace
+from bounded import ida_star
+from hpa import HierarchicalPlanner
+from generators import GENERATORS, DisjointSet, RandomSet, eller_rows
+from solvers import SOLVERS, Capabilities, SolverEngine, choose_solver, register_solver
+import vectorized
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def open_all_walls(maze):
+    """Break every interior wall, leaving an open room full of loops."""
+    cells = maze.cells
+    for i in range(maze.num_rows):
+        for j in range(maze.num_cols):
+            if j < maze.num_cols - 1:
+                maze._break_walls_between(cells[i][j], i, j, cells[i][j + 1], i, j + 1)
+            if i < maze.num_rows - 1:
+                maze._break_walls_between(cells[i][j], i, j, cells[i + 1][j], i + 1, j)
+
 
 class Tests(unittest.TestCase):
     def test_maze_create_cells(self):
@@ -93,5 +123,768 @@ class Tests(unittest.TestCase):
         self.assertFalse(cell2.has_left_wall)
 
 
+    def test_a_star_path_connects_entrance_and_exit(self):
+        """Test that A* returns a contiguous path from entrance to exit."""
+        self.maze = Maze(0, 0, 15, 20, 10, 10, seed=3)
+        self.maze.generate()
+        solution_steps = self.maze.solve("a_star")
+        self.assertEqual(solution_steps[0][0], self.maze.cells[0][0])
+        self.assertEqual(solution_steps[-1][1], self.maze.cells[14][19])
+        for (_, to_cell, _), (from_cell, _, is_undo) in zip(solution_steps, solution_steps[1:]):
+            self.assertEqual(to_cell, from_cell)
+            self.assertFalse(is_undo)
+
+    def test_get_cell_position(self):
+        """Test that cell positions and ids round-trip for every cell."""
+        self.maze = Maze(5, 7, 4, 6, 10, 20)
+        for i, row in enumerate(self.maze.cells):
+            for j, cell in enumerate(row):
+                self.assertEqual(self.maze.get_cell_position(cell), (i, j))
+                self.assertIs(self.maze.get_cell_by_id(self.maze.get_cell_id(cell)), cell)
+
+    def test_get_cell_position_foreign_cell(self):
+        """Test that a cell outside the maze grid is rejected."""
+        self.maze = Maze(0, 0, 4, 4, 10, 10)
+        with self.assertRaises(ValueError):
+            self.maze.get_cell_position(Cell(45, 0, 55, 10))
+        with self.assertRaises(ValueError):
+            self.maze.get_cell_position(Cell(5, 0, 15, 10))
+
+    def test_compact_maze_matches_cell_maze(self):
+        """Test that the bit-packed backend generates and solves the same maze as the cell backend."""
+        cell_maze = Maze(0, 0, 12, 9, 10, 10, seed=11)
+        cell_maze.generate()
+        cell_steps = cell_maze.solve("a_star")
+        compact_maze = Maze(0, 0, 12, 9, 10, 10, seed=11, compact=True)
+        compact_maze.generate()
+        compact_steps = compact_maze.solve("a_star")
+        for cell_row, compact_row in zip(cell_maze.cells, compact_maze.cells):
+            for cell, view in zip(cell_row, compact_row):
+                self.assertEqual((cell.has_top_wall, cell.has_left_wall, cell.has_bottom_wall, cell.has_right_wall),
+                                 (view.has_top_wall, view.has_left_wall, view.has_bottom_wall, view.has_right_wall))
+                self.assertFalse(view.visited)
+        self.assertEqual([(a.x1, a.y1, b.x1, b.y1) for a, b, _ in cell_steps],
+                         [(a.x1, a.y1, b.x1, b.y1) for a, b, _ in compact_steps])
+
+    def test_compact_break_walls_between_shares_wall(self):
+        """Test that breaking a wall in the compact backend opens both sides of the shared edge."""
+        self.maze = Maze(0, 0, 5, 5, 10, 10, compact=True)
+        cell1 = self.maze.cells[2][1]
+        cell2 = self.maze.cells[3][1]
+        self.maze._break_walls_between(cell1, 2, 1, cell2, 3, 1)
+        self.assertFalse(self.maze.cells[2][1].has_bottom_wall)
+        self.assertFalse(self.maze.cells[3][1].has_top_wall)
+        self.assertTrue(self.maze.cells[3][1].has_bottom_wall)
+        self.assertEqual(self.maze.get_cell_position(cell2), (3, 1))
+
+    def test_generate_is_deterministic_for_seed(self):
+        """Test that the same seed always carves the same maze."""
+        walls = []
+        for _ in range(2):
+            maze = Maze(0, 0, 8, 11, 10, 10, seed=5)
+            maze.generate()
+            walls.append([[(c.has_top_wall, c.has_left_wall, c.has_bottom_wall, c.has_right_wall) for c in row]
+                          for row in maze.cells])
+        self.assertEqual(walls[0], walls[1])
+
+    def test_generate_matches_recursive_backtracker(self):
+        """Test that seed 5 still carves the maze the original recursive backtracker did, on both backends."""
+        # One hex digit per cell: top wall 1, left 2, bottom 4, right 8
+        expected = ["4559b39", "793c68a", "3ca39ea", "296c69a", "e655540"]
+        for compact in (False, True):
+            maze = Maze(0, 0, 5, 7, 10, 10, seed=5, compact=compact)
+            maze.generate()
+            walls = ["".join("%x" % (c.has_top_wall | c.has_left_wall << 1 | c.has_bottom_wall << 2 | c.has_right_wall << 3)
+                             for c in row) for row in maze.cells]
+            self.assertEqual(walls, expected)
+
+    def test_generate_long_corridor_without_recursion(self):
+        """Test that generating a maze much longer than the recursion limit carves a spanning tree."""
+        num_cols = sys.getrecursionlimit() * 3
+        self.maze = Maze(0, 0, 1, num_cols, 10, 10, compact=True)
+        self.maze.generate()
+        row = self.maze.cells[0]
+        self.assertTrue(all(not row[j].has_right_wall for j in range(num_cols)))
+
+    def test_generate_memory_stays_a_few_bytes_per_cell(self):
+        """Test that the backtracker's stack and per-cell state stay far below one Python object per cell."""
+        self.maze = Maze(0, 0, 100, 100, 10, 10, seed=44, compact=True)
+        self.maze.cells
+        tracemalloc.start()
+        try:
+            self.maze.generate()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, 20 * 100 * 100)
+
+    def test_generate_single_cell(self):
+        """Test that a 1x1 maze can be generated."""
+        self.maze = Maze(0, 0, 1, 1, 10, 10)
+        self.maze.generate()
+        self.assertFalse(self.maze.cells[0][0].has_top_wall)
+        self.assertFalse(self.maze.cells[0][0].has_bottom_wall)
+
+    def test_dfs_long_path_without_recursion(self):
+        """Test that DFS solves a maze whose path is much longer than the recursion limit."""
+        num_rows = sys.getrecursionlimit() * 3
+        self.maze = Maze(0, 0, num_rows, 1, 10, 10, compact=True)
+        self.maze.generate()
+        solution_steps = self.maze.solve("dfs")
+        self.assertEqual(len(solution_steps), num_rows - 1)
+        self.assertEqual(solution_steps[-1][1], self.maze.cells[num_rows - 1][0])
+
+    def test_dfs_memory_stays_a_few_bytes_per_cell(self):
+        """Test that the DFS stack along a long corridor stays far below one Python object per cell."""
+        self.maze = Maze(0, 0, 1, 20000, 10, 10, compact=True)
+        self.maze.generate()
+        tracemalloc.start()
+        try:
+            for _ in self.maze.solve("dfs", stream=True):
+                pass
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, 20 * 20000)
+
+    def test_dfs_steps_stream_lazily(self):
+        """Test that the DFS step generator can be consumed one step at a time."""
+        self.maze = Maze(0, 0, 10, 10, 10, 10, seed=2)
+        self.maze.generate()
+        steps = self.maze.solve("dfs", stream=True)
+        first_from, _, first_undo = next(steps)
+        self.assertEqual(first_from, self.maze.cells[0][0])
+        self.assertFalse(first_undo)
+
+    def test_solve_stream_matches_list(self):
+        """Test that streamed steps match the materialised steps for every algorithm."""
+        for algorithm in ("dfs", "a_star"):
+            with self.subTest(algorithm=algorithm):
+                maze = Maze(0, 0, 10, 10, 10, 10, seed=8)
+                maze.generate()
+                random.seed(1)
+                steps = maze.solve(algorithm)
+                random.seed(1)
+                streamed = maze.solve(algorithm, stream=True)
+                self.assertNotIsInstance(streamed, list)
+                self.assertEqual(list(streamed), steps)
+
+    def test_solve_unknown_algorithm(self):
+        """Test that an unknown algorithm is rejected even in streaming mode."""
+        self.maze = Maze(0, 0, 3, 3, 10, 10)
+        with self.assertRaises(ValueError):
+            self.maze.solve("teleport", stream=True)
+
+    def test_dfs_can_be_solved_repeatedly(self):
+        """Test that solving the same maze twice finds the exit both times and leaves the cells untouched."""
+        self.maze = Maze(0, 0, 12, 12, 10, 10, seed=4)
+        self.maze.generate()
+        exit = self.maze.cells[11][11]
+        for _ in range(2):
+            solution_steps = self.maze.solve("dfs")
+            self.assertEqual(solution_steps[-1][1], exit)
+        self.assertFalse(any(cell.visited for row in self.maze.cells for cell in row))
+
+    def test_concurrent_solves(self):
+        """Test that interleaved solves of the same maze do not interfere with each other."""
+        self.maze = Maze(0, 0, 12, 12, 10, 10, seed=4)
+        self.maze.generate()
+        exit = self.maze.cells[11][11]
+        first = self.maze.solve("dfs", stream=True)
+        second = self.maze.solve("dfs", stream=True)
+        first_steps, second_steps = [], []
+        for first_step, second_step in zip(first, second):
+            first_steps.append(first_step)
+            second_steps.append(second_step)
+        first_steps.extend(first)
+        second_steps.extend(second)
+        self.assertEqual(first_steps[-1][1], exit)
+        self.assertEqual(second_steps[-1][1], exit)
+
+    def test_workspace_reused_across_queries(self):
+        """Test that a workspace answers repeated queries and only explores what each query needs."""
+        self.maze = Maze(0, 0, 20, 20, 10, 10, seed=6)
+        self.maze.generate()
+        workspace = SearchWorkspace(self.maze)
+        start, end = self.maze.cells[0][0], self.maze.cells[19][19]
+        full = self.maze.a_star_search(start, end, workspace)
+        self.assertEqual(full, self.maze.solve("a_star"))
+
+        near = full[0][1]
+        steps = self.maze.a_star_search(start, near, workspace)
+        self.assertEqual(steps, [(start, near, False)])
+        self.assertEqual(workspace.expanded, 1)
+        self.assertEqual(self.maze.a_star_search(start, end, workspace), full)
+
+    def test_workspace_size_and_epoch_wrap(self):
+        """Test that the workspace reports its per-cell arrays' size and stays correct when its epoch stamps wrap."""
+        self.maze = Maze(0, 0, 10, 10, 10, 10, seed=39)
+        self.maze.generate()
+        workspace = SearchWorkspace(self.maze)
+        self.assertEqual(workspace.nbytes, 100 * (2 * workspace.seen.itemsize + 2 * workspace.g.itemsize))
+        expected = workspace.a_star([0], [99])
+        workspace.epoch = (1 << (8 * workspace.seen.itemsize)) - 2
+        for _ in range(3):
+            self.assertEqual(workspace.a_star([0], [99]), expected)
+        self.assertLess(workspace.epoch, 10)
+
+    def test_pickle_and_copy_round_trip(self):
+        """Test that mazes survive pickling and deep copying with their walls and costs, and solve the same afterwards."""
+        for compact in (False, True):
+            with self.subTest(compact=compact):
+                self.maze = Maze(0, 0, 8, 8, 10, 10, seed=40, compact=compact)
+                self.maze.generate()
+                self.maze.set_cell_cost((3, 3), 5)
+                expected = self.maze.solve("a_star")
+                self.maze.tree_index()
+                for clone in (pickle.loads(pickle.dumps(self.maze)), copy.deepcopy(self.maze)):
+                    self.assertEqual(clone.get_cell_cost((3, 3)), 5)
+                    self.assertEqual([clone.get_cell_position(cell) for cell, _, _ in clone.solve("a_star")],
+                                     [self.maze.get_cell_position(cell) for cell, _, _ in expected])
+
+    def test_workspace_is_per_thread(self):
+        """Test that each thread gets its own default workspace."""
+        self.maze = Maze(0, 0, 3, 3, 10, 10)
+        workspaces = []
+        thread = threading.Thread(target=lambda: workspaces.append(self.maze.workspace()))
+        thread.start()
+        thread.join()
+        self.assertIs(self.maze.workspace(), self.maze.workspace())
+        self.assertIsNot(workspaces[0], self.maze.workspace())
+
+    def test_solve_between_arbitrary_cells(self):
+        """Test that every algorithm routes between arbitrary cells given as cells or positions."""
+        self.maze = Maze(0, 0, 10, 14, 10, 10, seed=12)
+        self.maze.generate()
+        start, goal = self.maze.cells[7][2], self.maze.cells[1][11]
+        for algorithm in ("dfs", "a_star"):
+            for endpoints in ((start, goal), ((7, 2), (1, 11))):
+                with self.subTest(algorithm=algorithm, endpoints=endpoints):
+                    steps = self.maze.solve(algorithm, start=endpoints[0], goal=endpoints[1])
+                    self.assertEqual(steps[0][0], start)
+                    self.assertEqual(steps[-1][1], goal)
+
+    def test_solve_from_start_set_to_goal_set(self):
+        """Test that a multi-source query starts at one of the starts and stops at one of the goals."""
+        self.maze = Maze(0, 0, 10, 10, 10, 10, seed=13)
+        self.maze.generate()
+        starts = [(0, 9), (9, 0)]
+        goals = [(5, 5), self.maze.cells[4][4]]
+        goal_cells = [self.maze.cells[5][5], self.maze.cells[4][4]]
+        for algorithm in ("dfs", "a_star"):
+            with self.subTest(algorithm=algorithm):
+                steps = self.maze.solve(algorithm, start=starts, goal=goals)
+                self.assertIn(steps[-1][1], goal_cells)
+        steps = self.maze.solve("a_star", start=starts, goal=goals)
+        self.assertIn(self.maze.get_cell_position(steps[0][0]), starts)
+
+    def test_solve_rejects_unsupported_endpoints(self):
+        """Test that endpoints that are neither cells nor positions raise ValueError."""
+        self.maze = Maze(0, 0, 5, 5, 10, 10, seed=42)
+        self.maze.generate()
+        for endpoint in (7, "ab", [(1, 1), 3], (1.0, 2.0)):
+            with self.subTest(endpoint=endpoint):
+                with self.assertRaises(ValueError):
+                    self.maze.solve("a_star", goal=endpoint)
+
+    @unittest.skipUnless(numpy, "NumPy is not installed")
+    def test_solve_accepts_numpy_positions(self):
+        """Test that positions made of NumPy integers, such as those from unravel_index, are accepted."""
+        self.maze = Maze(0, 0, 8, 8, 10, 10, seed=43)
+        self.maze.generate()
+        distances = self.maze.distance_grid()
+        farthest = numpy.unravel_index(distances.argmax(), distances.shape)
+        steps = self.maze.solve("a_star", goal=farthest)
+        self.assertEqual(len(steps), distances.max())
+        self.assertEqual(self.maze.get_cell_position(steps[-1][1]), tuple(int(k) for k in farthest))
+
+    def test_solve_rejects_positions_outside_maze(self):
+        """Test that out-of-range endpoints are rejected."""
+        self.maze = Maze(0, 0, 3, 3, 10, 10)
+        with self.assertRaises(ValueError):
+            self.maze.solve("a_star", start=(3, 0))
+
+    def test_tree_index_matches_a_star(self):
+        """Test that tree-index paths and distances match A* between arbitrary cells."""
+        self.maze = Maze(0, 0, 15, 12, 10, 10, seed=14)
+        self.maze.generate()
+        index = self.maze.tree_index()
+        rng = random.Random(0)
+        for _ in range(20):
+            start = (rng.randrange(15), rng.randrange(12))
+            goal = (rng.randrange(15), rng.randrange(12))
+            expected = self.maze.solve("a_star", start=start, goal=goal)
+            self.assertEqual(self.maze.solve("tree", start=start, goal=goal), expected)
+            self.assertEqual(index.distance(start[0] * 12 + start[1], goal[0] * 12 + goal[1]), len(expected))
+
+    def test_tree_index_rebuilt_after_walls_change(self):
+        """Test that the tree index is rebuilt after walls are broken and rejects mazes with loops."""
+        self.maze = Maze(0, 0, 4, 4, 10, 10, seed=15)
+        self.maze.generate()
+        index = self.maze.tree_index()
+        self.assertIs(self.maze.tree_index(), index)
+        for i, j in ((0, 0), (0, 1), (1, 0), (1, 1), (2, 2)):
+            for ni, nj in ((i + 1, j), (i, j + 1)):
+                self.maze._break_walls_between(self.maze.cells[i][j], i, j, self.maze.cells[ni][nj], ni, nj)
+        with self.assertRaises(ValueError):
+            self.maze.tree_index()
+
+    def test_bidirectional_path_matches_a_star(self):
+        """Test that the forward steps of a bidirectional solve form the shortest path."""
+        self.maze = Maze(0, 0, 14, 16, 10, 10, seed=16)
+        self.maze.generate()
+        for start, goal in (((0, 0), (13, 15)), ((5, 3), (5, 4)), ((13, 0), (0, 15))):
+            with self.subTest(start=start, goal=goal):
+                steps = self.maze.solve("bidirectional", start=start, goal=goal)
+                path = [step for step in steps if not step[2]]
+                self.assertEqual(path, self.maze.solve("a_star", start=start, goal=goal))
+                self.assertTrue(any(step[2] for step in steps))
+
+    def test_bidirectional_on_maze_with_loops(self):
+        """Test that bidirectional search stays shortest when the maze has several routes."""
+        self.maze = Maze(0, 0, 6, 6, 10, 10)
+        open_all_walls(self.maze)
+        steps = self.maze.solve("bidirectional")
+        self.assertEqual(len([step for step in steps if not step[2]]), 10)
+
+    @unittest.skipUnless(numpy, "NumPy is not installed")
+    def test_bfs_path_matches_a_star(self):
+        """Test that the vectorised BFS finds the same shortest paths as A* on both backends."""
+        for compact in (False, True):
+            with self.subTest(compact=compact):
+                maze = Maze(0, 0, 13, 17, 10, 10, seed=17, compact=compact)
+                maze.generate()
+                for start, goal in (((0, 0), (12, 16)), ((6, 2), (1, 14)), ((4, 4), (4, 4))):
+                    self.assertEqual(maze.solve("bfs", start=start, goal=goal),
+                                     maze.solve("a_star", start=start, goal=goal))
+
+    @unittest.skipUnless(numpy, "NumPy is not installed")
+    def test_distance_grid(self):
+        """Test that the distance grid agrees with the tree index for every cell."""
+        self.maze = Maze(0, 0, 9, 11, 10, 10, seed=18)
+        self.maze.generate()
+        distances = self.maze.distance_grid()
+        index = self.maze.tree_index()
+        for i in range(9):
+            for j in range(11):
+                self.assertEqual(distances[i, j], index.distance(0, i * 11 + j))
+
+    @unittest.skipUnless(numpy, "NumPy is not installed")
+    def test_dead_end_filling_leaves_only_solution(self):
+        """Test that dead-end filling leaves exactly the solution corridor of a perfect maze."""
+        self.maze = Maze(0, 0, 16, 13, 10, 10, seed=19, compact=True)
+        self.maze.generate()
+        expected = self.maze.solve("a_star")
+        self.assertEqual(self.maze.solve("dead_end_filling"), expected)
+        filled = vectorized.dead_end_fill(self.maze, [0, 16 * 13 - 1])
+        self.assertEqual(int((~filled).sum()), len(expected) + 1)
+
+    @unittest.skipUnless(numpy, "NumPy is not installed")
+    def test_dead_end_filling_between_arbitrary_cells(self):
+        """Test dead-end filling between interior cells."""
+        self.maze = Maze(0, 0, 10, 10, 10, 10, seed=20)
+        self.maze.generate()
+        self.assertEqual(self.maze.solve("dead_end_filling", start=(3, 7), goal=(8, 1)),
+                         self.maze.solve("a_star", start=(3, 7), goal=(8, 1)))
+
+    def test_junction_graph_matches_a_star(self):
+        """Test that junction-graph paths match A* for endpoints on junctions and inside corridors."""
+        self.maze = Maze(0, 0, 14, 14, 10, 10, seed=21)
+        self.maze.generate()
+        graph = self.maze.junction_graph()
+        self.assertLess(graph.num_nodes, 14 * 14)
+        rng = random.Random(1)
+        for _ in range(30):
+            start = (rng.randrange(14), rng.randrange(14))
+            goal = (rng.randrange(14), rng.randrange(14))
+            self.assertEqual(self.maze.solve("junction", start=start, goal=goal),
+                             self.maze.solve("a_star", start=start, goal=goal))
+
+    def test_junction_graph_with_loops(self):
+        """Test that junction-graph search stays shortest when corridors form loops."""
+        self.maze = Maze(0, 0, 5, 5, 10, 10)
+        cells = self.maze.cells
+        ring = [(0, j) for j in range(5)] + [(i, 4) for i in range(1, 5)] + \
+            [(4, j) for j in range(3, -1, -1)] + [(i, 0) for i in range(3, -1, -1)]
+        for (i1, j1), (i2, j2) in zip(ring, ring[1:]):
+            self.maze._break_walls_between(cells[i1][j1], i1, j1, cells[i2][j2], i2, j2)
+        for start, goal in (((0, 2), (4, 2)), ((0, 1), (1, 0)), ((2, 0), (2, 4))):
+            steps = self.maze.solve("junction", start=start, goal=goal)
+            shortest = [step for step in self.maze.solve("bidirectional", start=start, goal=goal) if not step[2]]
+            self.assertEqual(len(steps), len(shortest))
+            self.assertEqual(self.maze.get_cell_position(steps[-1][1]), goal)
+
+    def test_hpa_matches_shortest_paths(self):
+        """Test that hierarchical A* returns shortest paths, including within one cluster and with loops."""
+        self.maze = Maze(0, 0, 20, 23, 10, 10, seed=22)
+        self.maze.generate()
+        rng = random.Random(2)
+        for _ in range(40):
+            i, j = rng.randrange(19), rng.randrange(23)
+            self.maze._break_walls_between(self.maze.cells[i][j], i, j, self.maze.cells[i + 1][j], i + 1, j)
+        planner = HierarchicalPlanner(self.maze, cluster_size=5)
+        for _ in range(30):
+            start = rng.randrange(20 * 23)
+            goals = [rng.randrange(20 * 23), rng.randrange(20 * 23)]
+            path = planner.shortest_path([start], goals)
+            shortest = [step for step in self.maze.solve("bidirectional", start=divmod(start, 23),
+                                                         goal=[divmod(goal, 23) for goal in goals]) if not step[2]]
+            self.assertEqual(len(path) - 1, len(shortest))
+            self.assertIn(path[-1], goals)
+            for a, b in zip(path, path[1:]):
+                self.assertIn(divmod(b, 23), self.maze._open_neighbor_positions(*divmod(a, 23)))
+
+    def test_hpa_planner_cached_across_queries(self):
+        """Test that the maze keeps its planner and refined paths between queries."""
+        self.maze = Maze(0, 0, 40, 40, 10, 10, seed=23, compact=True)
+        self.maze.generate()
+        self.assertEqual(self.maze.solve("hpa"), self.maze.solve("a_star"))
+        planner = self.maze.hpa_planner()
+        self.assertTrue(planner._refined)
+        self.assertEqual(self.maze.solve("hpa", start=(39, 0), goal=(0, 39)),
+                         self.maze.solve("a_star", start=(39, 0), goal=(0, 39)))
+        self.assertIs(self.maze.hpa_planner(), planner)
+
+    def test_weighted_cells_are_avoided(self):
+        """Test that cost-aware algorithms route around expensive cells."""
+        self.maze = Maze(0, 0, 3, 3, 1, 1)
+        cells = self.maze.cells
+        open_all_walls(self.maze)
+        self.maze.set_cell_cost((1, 1), 9)
+        self.assertEqual(self.maze.get_cell_cost(cells[1][1]), 9)
+        for algorithm in ("dijkstra", "a_star", "ida_star"):
+            with self.subTest(algorithm=algorithm):
+                steps = self.maze.solve(algorithm, start=(1, 0), goal=(1, 2))
+                self.assertEqual(len(steps), 4)
+                self.assertNotIn(cells[1][1], [to_cell for _, to_cell, _ in steps])
+        unweighted = self.maze.solve("bidirectional", start=(1, 0), goal=(1, 2))
+        self.assertEqual(len([step for step in unweighted if not step[2]]), 2)
+
+    def test_set_cell_cost_accepts_only_positive_integers(self):
+        """Test that cell costs may be NumPy integers but not booleans, floats or values below 1."""
+        self.maze = Maze(0, 0, 3, 3, 10, 10)
+        for cost in (True, 0, 1.5, "2"):
+            with self.subTest(cost=cost):
+                with self.assertRaises(ValueError):
+                    self.maze.set_cell_cost((1, 1), cost)
+        if numpy is not None:
+            self.maze.set_cell_cost((1, 1), numpy.int64(4))
+            self.assertEqual(self.maze.get_cell_cost((1, 1)), 4)
+            self.assertIs(type(self.maze._max_cost), int)
+
+    def test_dijkstra_matches_a_star_cost(self):
+        """Test that bucket-queue Dijkstra and A* find paths of equal total cost on a weighted maze."""
+        self.maze = Maze(0, 0, 12, 12, 1, 1, seed=24)
+        self.maze.generate()
+        rng = random.Random(3)
+        for _ in range(30):
+            i, j = rng.randrange(11), rng.randrange(12)
+            self.maze._break_walls_between(self.maze.cells[i][j], i, j, self.maze.cells[i + 1][j], i + 1, j)
+            self.maze.set_cell_cost((rng.randrange(12), rng.randrange(12)), rng.randrange(1, 6))
+
+        def total_cost(steps):
+            return sum(self.maze.get_cell_cost(to_cell) for _, to_cell, _ in steps)
+        for _ in range(10):
+            start, goal = (rng.randrange(12), rng.randrange(12)), (rng.randrange(12), rng.randrange(12))
+            self.assertEqual(total_cost(self.maze.solve("dijkstra", start=start, goal=goal)),
+                             total_cost(self.maze.solve("a_star", start=start, goal=goal)))
+            self.assertEqual(total_cost(self.maze.solve("ida_star", start=start, goal=goal)),
+                             total_cost(self.maze.solve("a_star", start=start, goal=goal)))
+
+    def test_dijkstra_with_large_costs(self):
+        """Test that Dijkstra and auto mode leave the bucket queue once a cell cost is too large for it."""
+        self.maze = Maze(0, 0, 10, 10, 10, 10, seed=45)
+        self.maze.generate()
+        self.maze.set_cell_cost((4, 4), 10 ** 7)
+        self.assertEqual(self.maze.solve("dijkstra"), self.maze.solve("a_star"))
+        self.assertEqual(choose_solver(self.maze, [0], set(range(20))), "a_star")
+
+    def test_bucket_queue_pops_in_priority_order(self):
+        """Test that the bucket queue returns items by priority as priorities advance."""
+        queue = BucketQueue(3)
+        queue.push(0, 10)
+        queue.push(2, 12)
+        queue.push(1, 11)
+        self.assertEqual(queue.pop(), (0, 10))
+        queue.push(3, 13)
+        self.assertEqual([queue.pop() for _ in range(3)], [(1, 11), (2, 12), (3, 13)])
+        with self.assertRaises(IndexError):
+            queue.pop()
+
+    def test_manhattan_distance_in_grid_units(self):
+        """Test that the Manhattan distance counts cells regardless of the cell size."""
+        self.maze = Maze(0, 0, 5, 5, 10, 30)
+        self.assertEqual(self.maze.manhattan_distance(self.maze.cells[0][0], self.maze.cells[2][3]), 5)
+
+    def test_a_star_heuristics(self):
+        """Test that every heuristic finds a shortest path and that Manhattan with tie-breaking expands the least."""
+        self.maze = Maze(0, 0, 30, 30, 10, 25)
+        open_all_walls(self.maze)
+        expanded = {}
+        for heuristic in HEURISTICS:
+            steps = self.maze.solve("a_star", heuristic=heuristic)
+            self.assertEqual(len(steps), 58)
+            expanded[heuristic] = self.maze.workspace().expanded
+        self.assertEqual(expanded["manhattan"], 58)
+        self.assertGreater(expanded["zero"], 10 * expanded["manhattan"])
+        with self.assertRaises(ValueError):
+            self.maze.solve("a_star", heuristic="euclidean")
+
+    def test_scaled_heuristic_uses_cheapest_cost(self):
+        """Test that the scaled heuristic stays optimal when every cell is expensive."""
+        self.maze = Maze(0, 0, 6, 6, 10, 10, seed=25)
+        self.maze.generate()
+        self.maze.set_cell_cost([(i, j) for i in range(6) for j in range(6)], 3)
+        self.assertEqual(self.maze.min_cell_cost, 3)
+        self.assertEqual(self.maze.solve("a_star", heuristic="scaled"), self.maze.solve("dijkstra"))
+
+    def test_register_custom_solver(self):
+        """Test that a registered engine is reachable through Maze.solve."""
+        @register_solver
+        class StraightLineSolver(SolverEngine):
+            name = "straight_line"
+            capabilities = Capabilities(streaming=True)
+
+            def steps(self, maze, starts, goals, **options):
+                yield (starts[0], starts[0] + 1, False)
+        try:
+            self.maze = Maze(0, 0, 3, 3, 10, 10)
+            self.assertEqual(self.maze.solve("straight_line"), [(self.maze.cells[0][0], self.maze.cells[0][1], False)])
+        finally:
+            del SOLVERS["straight_line"]
+        with self.assertRaises(ValueError):
+            self.maze.solve("straight_line")
+
+    def test_auto_solver_choice(self):
+        """Test that auto mode reuses built indexes and switches to cost-aware engines on weighted mazes."""
+        self.maze = Maze(0, 0, 10, 10, 10, 10, seed=26)
+        self.maze.generate()
+        starts, goals = [0], {99}
+        self.assertEqual(choose_solver(self.maze, starts, goals), "a_star")
+        self.maze.junction_graph()
+        self.assertEqual(choose_solver(self.maze, starts, goals), "junction")
+        self.maze.tree_index()
+        self.assertEqual(choose_solver(self.maze, starts, goals), "tree")
+        self.assertEqual(self.maze.solve("auto"), self.maze.solve("a_star"))
+        self.maze.set_cell_cost((5, 5), 4)
+        self.assertEqual(choose_solver(self.maze, starts, goals), "a_star")
+        self.assertEqual(choose_solver(self.maze, starts, set(range(20))), "dijkstra")
+
+    def test_auto_solver_picks_registered_engines_by_capabilities(self):
+        """Test that auto mode picks a third-party engine once its index is built, and never returns exploration steps."""
+        class CornerIndex:
+            def __init__(self, maze):
+                self.maze = maze
+
+        @register_solver
+        class CornerSolver(SolverEngine):
+            name = "corner"
+            capabilities = Capabilities(optimal=True, parallel=True, index=CornerIndex)
+
+            def steps(self, maze, starts, goals, **options):
+                return SOLVERS["a_star"]().steps(maze, starts, goals)
+        try:
+            self.maze = Maze(0, 0, 10, 10, 10, 10, seed=46)
+            self.maze.generate()
+            self.assertEqual(choose_solver(self.maze, [0], {99}), "a_star")
+            self.maze._cached_index(CornerIndex)
+            self.assertEqual(choose_solver(self.maze, [0], {99}), "corner")
+        finally:
+            del SOLVERS["corner"]
+
+        goals = [(9, j) for j in range(10)]
+        expected = self.maze.solve("a_star", goal=goals)
+        np = vectorized.np
+        try:
+            for numpy_module in (np, None):
+                vectorized.np = numpy_module
+                self.assertEqual(len(self.maze.solve("auto", goal=goals)), len(expected))
+                self.assertNotIn(choose_solver(self.maze, [0], set(range(90, 100))), ("bidirectional", "ida_star"))
+        finally:
+            vectorized.np = np
+
+    def test_every_optimal_solver_agrees(self):
+        """Test that every registered optimal engine returns a shortest path."""
+        self.maze = Maze(0, 0, 9, 9, 10, 10, seed=27)
+        self.maze.generate()
+        expected = len(self.maze.solve("a_star", start=(8, 0), goal=(0, 8)))
+        for name, engine in SOLVERS.items():
+            if engine.capabilities.optimal and (numpy or not engine.capabilities.requires_numpy):
+                with self.subTest(name=name):
+                    path = [step for step in self.maze.solve(name, start=(8, 0), goal=(0, 8)) if not step[2]]
+                    self.assertEqual(len(path), expected)
+
+    def test_wall_follower_reaches_exit(self):
+        """Test that the forward steps the wall follower leaves standing are the unique path of a perfect maze."""
+        self.maze = Maze(0, 0, 15, 15, 10, 10, seed=28)
+        self.maze.generate()
+        steps = self.maze.solve("wall_follower")
+        path = []
+        for from_cell, to_cell, is_undo in steps:
+            if is_undo:
+                self.assertEqual(path.pop(), (from_cell, to_cell))
+            else:
+                path.append((from_cell, to_cell))
+        self.assertEqual([(from_cell, to_cell, False) for from_cell, to_cell in path], self.maze.solve("a_star"))
+        self.assertGreater(len(steps), len(path))
+
+    def test_ida_star_peaks_below_a_star(self):
+        """Test that IDA* allocates less memory than A* on a fresh workspace for the same perfect-maze query."""
+        self.maze = Maze(0, 0, 30, 30, 10, 10, seed=38)
+        self.maze.generate()
+
+        def peak(search):
+            tracemalloc.start()
+            try:
+                path = search()
+                return tracemalloc.get_traced_memory()[1], path
+            finally:
+                tracemalloc.stop()
+        ida_peak, ida_path = peak(lambda: ida_star(self.maze, [0], {899}))
+        a_star_peak, a_star_path = peak(lambda: SearchWorkspace(self.maze).a_star([0], {899}))
+        self.assertEqual(ida_path, a_star_path)
+        self.assertLess(ida_peak, a_star_peak)
+
+    def test_wall_follower_gives_up_on_island(self):
+        """Test that the wall follower stops and undoes its walk when the goal sits on an island it cannot reach."""
+        self.maze = Maze(0, 0, 3, 3, 1, 1)
+        cells = self.maze.cells
+        ring = [(0, 0), (0, 1), (0, 2), (1, 2), (2, 2), (2, 1), (2, 0), (1, 0), (0, 0)]
+        for (i1, j1), (i2, j2) in zip(ring, ring[1:]):
+            self.maze._break_walls_between(cells[i1][j1], i1, j1, cells[i2][j2], i2, j2)
+        steps = self.maze.solve("wall_follower", goal=(1, 1))
+        self.assertTrue(steps)
+        self.assertEqual(len([step for step in steps if not step[2]]), len([step for step in steps if step[2]]))
+        self.assertEqual(self.maze.solve("ida_star", goal=(1, 1)), [])
+
+    def test_ida_star_gives_up_in_room_with_loops(self):
+        """Test that IDA* keeps its walks simple and reports an unreachable goal in an open room full of loops."""
+        self.maze = Maze(0, 0, 4, 4, 10, 10)
+        open_all_walls(self.maze)
+        cells = self.maze.cells
+        self.maze._add_walls_between(cells[3][3], 3, 3, cells[2][3], 2, 3)
+        self.maze._add_walls_between(cells[3][3], 3, 3, cells[3][2], 3, 2)
+        self.assertIsNone(ida_star(self.maze, [0], {15}))
+        self.assertEqual(len(ida_star(self.maze, [0], {14})), 6)
+
+    def test_add_walls_between_undoes_break(self):
+        """Test that _add_walls_between restores the walls removed by _break_walls_between on both storage backends."""
+        for compact in (False, True):
+            with self.subTest(compact=compact):
+                self.maze = Maze(0, 0, 4, 4, 10, 10, compact=compact)
+                cells = self.maze.cells
+                self.maze._break_walls_between(cells[1][1], 1, 1, cells[1][2], 1, 2)
+                self.maze._add_walls_between(cells[1][1], 1, 1, cells[1][2], 1, 2)
+                self.assertTrue(cells[1][1].has_right_wall)
+                self.assertTrue(cells[1][2].has_left_wall)
+                self.assertEqual(self.maze._open_neighbor_positions(1, 1), [])
+
+    def test_incremental_planner_tracks_wall_changes(self):
+        """Test that the incremental planner matches A* after every wall edit while repairing only part of the search."""
+        self.maze = Maze(0, 0, 20, 20, 10, 10, seed=29)
+        self.maze.generate()
+        planner = self.maze.incremental_planner()
+        self.assertEqual(len(planner.shortest_path()) - 1, len(self.maze.solve("a_star")))
+        full_search = planner.expanded
+        rng = random.Random(4)
+        for _ in range(40):
+            i, j = rng.randrange(19), rng.randrange(20)
+            if rng.random() < 0.5:
+                planner.open_wall((i, j), (i + 1, j))
+            else:
+                planner.close_wall((i, j), (i + 1, j))
+            path = planner.shortest_path()
+            expected = self.maze.workspace().a_star([0], [399])
+            self.assertEqual(path is None, expected is None)
+            if path is not None:
+                self.assertEqual(len(path), len(expected))
+                self.assertLess(planner.expanded, full_search)
+
+    def test_incremental_planner_moving_start(self):
+        """Test that moving the start along the path keeps the planner's answers cheapest on a weighted maze."""
+        self.maze = Maze(0, 0, 12, 12, 10, 10, seed=30)
+        self.maze.generate()
+        rng = random.Random(5)
+        for _ in range(15):
+            self.maze.set_cell_cost((rng.randrange(12), rng.randrange(12)), rng.randrange(2, 6))
+        planner = self.maze.incremental_planner()
+        path = planner.shortest_path()
+        while len(path) > 1:
+            planner.move_to(path[1])
+            i, j = rng.randrange(12), rng.randrange(11)
+            planner.open_wall((i, j), (i, j + 1))
+            path = planner.shortest_path()
+            expected = self.maze.workspace().a_star([planner.start], [143])
+            self.assertEqual(sum(self.maze._costs[k] for k in path[1:]), sum(self.maze._costs[k] for k in expected[1:]))
+
+    def test_every_generator_makes_reproducible_perfect_mazes(self):
+        """Test that every generator makes a perfect maze with an open entrance and exit, reproducibly on both backends."""
+        for algorithm in GENERATORS:
+            for num_rows, num_cols in ((13, 9), (1, 6), (6, 1)):
+                with self.subTest(algorithm=algorithm, size=(num_rows, num_cols)):
+                    walls = []
+                    for compact in (False, True, True):
+                        maze = Maze(0, 0, num_rows, num_cols, 10, 10, seed=31, compact=compact)
+                        try:
+                            maze.generate(algorithm)
+                        except ImportError:
+                            break  # NumPy is not installed; only this generator is skipped
+                        maze.tree_index()  # Raises ValueError on loops or unreachable cells
+                        self.assertFalse(maze.cells[0][0].has_top_wall)
+                        self.assertFalse(maze.cells[num_rows - 1][num_cols - 1].has_bottom_wall)
+                        walls.append([maze._open_neighbor_positions(i, j) for i in range(num_rows) for j in range(num_cols)])
+                    else:
+                        self.assertEqual(walls[0], walls[1])
+                        self.assertEqual(walls[1], walls[2])
+        with self.assertRaises(ValueError):
+            Maze(0, 0, 3, 3, 10, 10).generate("unknown")
+
+    def test_disjoint_set(self):
+        """Test that the union-find merges sets and reports when two items are already connected."""
+        regions = DisjointSet(6)
+        self.assertTrue(regions.union(0, 1))
+        self.assertTrue(regions.union(2, 3))
+        self.assertTrue(regions.union(1, 3))
+        self.assertFalse(regions.union(0, 2))
+        self.assertEqual(regions.find(0), regions.find(3))
+        self.assertNotEqual(regions.find(0), regions.find(4))
+
+    def test_eller_rows_stream_lazily(self):
+        """Test that Eller rows can be taken from a maze far too tall to hold, with the border walls set."""
+        rows = eller_rows(10 ** 15, 50)
+        for _ in range(20):
+            right_walls, bottom_walls = next(rows)
+            self.assertTrue(right_walls >> 49 & 1)
+            self.assertLess(right_walls, 1 << 50)
+            self.assertNotEqual(bottom_walls, (1 << 50) - 1)  # Every row carves down somewhere
+        *_, (_, bottom_walls) = eller_rows(5, 8)
+        self.assertEqual(bottom_walls, (1 << 8) - 1)
+
+    def test_wilson_is_uniform(self):
+        """Test that each of the four spanning trees of a 2x2 grid comes out about equally often."""
+        random.seed(34)
+        counts = {}
+        for _ in range(4000):
+            maze = Maze(0, 0, 2, 2, 10, 10)
+            maze.generate("wilson")
+            shape = tuple(tuple(maze._open_neighbor_positions(i, j)) for i in range(2) for j in range(2))
+            counts[shape] = counts.get(shape, 0) + 1
+        self.assertEqual(len(counts), 4)
+        for count in counts.values():
+            self.assertAlmostEqual(count, 1000, delta=150)
+
+    def test_random_set(self):
+        """Test that RandomSet ignores duplicates and pops every member exactly once."""
+        members = RandomSet(10)
+        for item in (3, 7, 3, 0, 9):
+            members.add(item)
+        self.assertEqual(len(members), 4)
+        self.assertIn(7, members)
+        self.assertNotIn(5, members)
+        popped = {members.pop_random() for _ in range(4)}
+        self.assertEqual(popped, {0, 3, 7, 9})
+        self.assertEqual(len(members), 0)
+        self.assertNotIn(3, members)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,83 @@
+"""Precomputed path index for perfect mazes."""
+from array import array
+from collections import deque
+from typing import List
+
+class TreeIndex:
+    """Answers distance and path queries on a perfect maze by treating it as a rooted tree.
+
+    A perfect maze has exactly one path between any two cells. The index roots that spanning tree at cell 0 and
+    stores every cell's depth plus a binary-lifting table of 2^k-th ancestors, so the lowest common ancestor of two
+    cells is found in O(log n). distance() is O(log n) and path() is O(log n) plus the length of the path."""
+
+    def __init__(self, maze) -> None:
+        num_cols = maze.num_cols
+        size = maze.num_rows * num_cols
+        parent = array("q", [-1]) * size
+        depth = array("q", [0]) * size
+
+        # Breadth-first walk from the root; meeting an already-reached cell other than the parent means a loop.
+        parent[0] = 0
+        reached = 1
+        queue = deque([0])
+        while queue:
+            current = queue.popleft()
+            i, j = divmod(current, num_cols)
+            for ni, nj in maze._open_neighbor_positions(i, j):
+                neighbor = ni * num_cols + nj
+                if neighbor == parent[current]:
+                    continue
+                if parent[neighbor] >= 0:
+                    raise ValueError("Maze has a loop, so paths are not unique")
+                parent[neighbor] = current
+                depth[neighbor] = depth[current] + 1
+                reached += 1
+                queue.append(neighbor)
+        if reached != size:
+            raise ValueError("Maze is not connected, so some cells have no path between them")
+
+        self.depth = depth
+        self.up: List[array] = [parent]
+        for _ in range(1, max(1, max(depth).bit_length())):
+            previous = self.up[-1]
+            self.up.append(array("q", map(previous.__getitem__, previous)))
+
+    def _ancestor(self, cell_id: int, steps: int) -> int:
+        """Return the ancestor steps levels above cell_id."""
+        k = 0
+        while steps:
+            if steps & 1:
+                cell_id = self.up[k][cell_id]
+            steps >>= 1
+            k += 1
+        return cell_id
+
+    def lowest_common_ancestor(self, a: int, b: int) -> int:
+        """Return the deepest cell that lies on both cells' paths to the root."""
+        if self.depth[a] < self.depth[b]:
+            a, b = b, a
+        a = self._ancestor(a, self.depth[a] - self.depth[b])
+        if a == b:
+            return a
+        for level in reversed(self.up):
+            if level[a] != level[b]:
+                a, b = level[a], level[b]
+        return self.up[0][a]
+
+    def distance(self, a: int, b: int) -> int:
+        """Return the number of moves on the unique path between two cells."""
+        return self.depth[a] + self.depth[b] - 2 * self.depth[self.lowest_common_ancestor(a, b)]
+
+    def path(self, a: int, b: int) -> List[int]:
+        """Return the cell ids on the unique path from a to b, both included."""
+        meeting = self.lowest_common_ancestor(a, b)
+        parent = self.up[0]
+        head = [a]
+        while head[-1] != meeting:
+            head.append(parent[head[-1]])
+        tail = [b]
+        while tail[-1] != meeting:
+            tail.append(parent[tail[-1]])
+        tail.pop()
+        tail.reverse()
+        return head + tail
@@ -0,0 +1,245 @@
+"""NumPy-vectorised maze algorithms that work on whole wall arrays instead of individual cells."""
+from collections import deque
+from typing import Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only the functions in this module need it
+    np = None
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("The vectorised maze algorithms require NumPy")
+
+
+def wall_arrays(maze) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Return the maze walls as boolean arrays (True means a wall is present).
+
+    horizontal has shape (num_rows + 1, num_cols): entry (r, c) is the top wall of cell (r, c), and the last row
+    is the bottom border. vertical has shape (num_rows, num_cols + 1): entry (r, c) is the left wall of cell
+    (r, c), and the last column is the right border. This is the WallGrid layout, so compact mazes are unpacked
+    straight from their bit arrays."""
+    _require_numpy()
+    num_rows, num_cols = maze.num_rows, maze.num_cols
+    if maze.compact:
+        walls = maze.cells.walls
+        horizontal = np.unpackbits(np.frombuffer(bytes(walls.horizontal), dtype=np.uint8), bitorder="little")
+        vertical = np.unpackbits(np.frombuffer(bytes(walls.vertical), dtype=np.uint8), bitorder="little")
+        horizontal = horizontal[:(num_rows + 1) * num_cols].reshape(num_rows + 1, num_cols).astype(bool)
+        vertical = vertical[:num_rows * (num_cols + 1)].reshape(num_rows, num_cols + 1).astype(bool)
+        return horizontal, vertical
+
+    horizontal = np.ones((num_rows + 1, num_cols), dtype=bool)
+    vertical = np.ones((num_rows, num_cols + 1), dtype=bool)
+    for i, row in enumerate(maze.cells):
+        horizontal[i] = [cell.has_top_wall for cell in row]
+        vertical[i, :num_cols] = [cell.has_left_wall for cell in row]
+        vertical[i, num_cols] = row[num_cols - 1].has_right_wall
+    horizontal[num_rows] = [cell.has_bottom_wall for cell in maze.cells[num_rows - 1]]
+    return horizontal, vertical
+
+
+def write_wall_arrays(maze, horizontal: "np.ndarray", vertical: "np.ndarray") -> None:
+    """Replace all of the maze's walls with boolean arrays in the wall_arrays layout.
+
+    Compact mazes get the arrays packed straight into their WallGrid bits; cell mazes have every cell's flags set."""
+    _require_numpy()
+    maze._revision += 1  # Invalidates indexes built from the previous walls
+    if maze.compact:
+        walls = maze.cells.walls
+        walls.horizontal[:] = np.packbits(horizontal.ravel(), bitorder="little").tobytes()
+        walls.vertical[:] = np.packbits(vertical.ravel(), bitorder="little").tobytes()
+        return
+
+    horizontal, vertical = horizontal.tolist(), vertical.tolist()
+    for i, row in enumerate(maze.cells):
+        top, bottom, sides = horizontal[i], horizontal[i + 1], vertical[i]
+        for j, cell in enumerate(row):
+            cell.has_top_wall = top[j]
+            cell.has_bottom_wall = bottom[j]
+            cell.has_left_wall = sides[j]
+            cell.has_right_wall = sides[j + 1]
+
+
+def binary_tree_walls(num_rows: int, num_cols: int, rng: "np.random.Generator") -> Tuple["np.ndarray", "np.ndarray"]:
+    """Return the walls of a binary-tree maze in the wall_arrays layout, border walls included.
+
+    Every cell independently opens its top or its left wall; cells in the top row can only go left and cells in
+    the left column only up, so every cell has a path to the top-left corner. The result is a perfect maze with an
+    open top row and left column, built with a few whole-array operations."""
+    _require_numpy()
+    carve_up = rng.random((num_rows, num_cols)) < 0.5
+    carve_up[0, :] = False
+    carve_up[:, 0] = True
+    horizontal = np.ones((num_rows + 1, num_cols), dtype=bool)
+    vertical = np.ones((num_rows, num_cols + 1), dtype=bool)
+    horizontal[1:num_rows] = ~carve_up[1:]
+    vertical[:, 1:num_cols] = carve_up[:, 1:]
+    return horizontal, vertical
+
+
+def sidewinder_walls(num_rows: int, num_cols: int, rng: "np.random.Generator") -> Tuple["np.ndarray", "np.ndarray"]:
+    """Return the walls of a sidewinder maze in the wall_arrays layout, border walls included.
+
+    The top row is one corridor. In every other row each cell either extends the current run to the right or
+    closes it, and a closed run opens the top wall of one of its cells chosen at random. Because the last cell of
+    every row closes its run, the runs are contiguous in row-major order, so each run's start is the cell after
+    the previous run's end and all runs are handled together."""
+    _require_numpy()
+    size = num_rows * num_cols
+    closes = rng.random((num_rows, num_cols)) < 0.5
+    closes[0, :] = False
+    closes[:, num_cols - 1] = True
+    vertical = np.ones((num_rows, num_cols + 1), dtype=bool)
+    vertical[:, 1:num_cols] = closes[:, :num_cols - 1]
+
+    ends = np.flatnonzero(closes)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    chosen = starts + (rng.random(ends.size) * (ends - starts + 1)).astype(np.int64)
+    top = np.ones(size, dtype=bool)
+    top[chosen] = False
+    horizontal = np.ones((num_rows + 1, num_cols), dtype=bool)
+    horizontal[1:num_rows] = top.reshape(num_rows, num_cols)[1:]
+    return horizontal, vertical
+
+
+def open_moves(maze) -> List[Tuple["np.ndarray", int]]:
+    """Return (mask, offset) pairs for moving up, left, down and right between flat cell ids.
+
+    mask[cell_id] is True when that move leaves cell_id without crossing a wall or the maze border, and
+    cell_id + offset is the cell it arrives in."""
+    horizontal, vertical = wall_arrays(maze)
+    num_rows, num_cols = maze.num_rows, maze.num_cols
+    up = ~horizontal[:num_rows]
+    up[0, :] = False
+    down = ~horizontal[1:]
+    down[num_rows - 1, :] = False
+    left = ~vertical[:, :num_cols]
+    left[:, 0] = False
+    right = ~vertical[:, 1:]
+    right[:, num_cols - 1] = False
+    return [(up.ravel(), -num_cols), (left.ravel(), -1), (down.ravel(), num_cols), (right.ravel(), 1)]
+
+
+def neighbor_table(maze) -> "np.ndarray":
+    """Return an (num_rows * num_cols, 4) array of the ids reachable up, left, down and right of each cell, -1 where blocked."""
+    cell_ids = np.arange(maze.num_rows * maze.num_cols, dtype=np.int64)
+    return np.stack([np.where(mask, cell_ids + offset, -1) for mask, offset in open_moves(maze)], axis=1)
+
+
+def _wavefront(maze, starts: Iterable[int], goals: Optional[Iterable[int]]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Run the breadth-first wavefront and return flat (distances, parents) arrays, -1 where unreached.
+
+    Each iteration gathers the neighbor-table rows of the whole frontier, drops blocked and already-reached
+    entries and deduplicates the rest with a scatter/gather marker, so the Python-level work is one iteration
+    per BFS layer rather than one per cell. If goals are given the wavefront stops after the layer that first
+    reaches one of them."""
+    _require_numpy()
+    table = neighbor_table(maze)
+    size = maze.num_rows * maze.num_cols
+    distances = np.full(size, -1, dtype=np.int64)
+    parents = np.full(size, -1, dtype=np.int64)
+    marker = np.empty(size, dtype=np.int64)
+    frontier = np.unique(np.fromiter(starts, dtype=np.int64))
+    distances[frontier] = 0
+    goal_mask = None
+    if goals is not None:
+        goal_mask = np.zeros(size, dtype=bool)
+        goal_mask[np.fromiter(goals, dtype=np.int64)] = True
+
+    layer = 0
+    while frontier.size and (goal_mask is None or not goal_mask[frontier].any()):
+        layer += 1
+        candidates = table[frontier]
+        sources = np.broadcast_to(frontier[:, None], candidates.shape)
+        passable = candidates >= 0
+        reached, sources = candidates[passable], sources[passable]
+        fresh = distances[reached] < 0
+        reached, sources = reached[fresh], sources[fresh]
+        # Several frontier cells can reach the same cell when the maze has loops; keep one entry per cell.
+        order = np.arange(reached.size)
+        marker[reached] = order
+        first = marker[reached] == order
+        frontier = reached[first]
+        distances[frontier] = layer
+        parents[frontier] = sources[first]
+    return distances, parents
+
+
+def bfs_distances(maze, starts: Iterable[int], goals: Optional[Iterable[int]] = None) -> "np.ndarray":
+    """Return a (num_rows, num_cols) grid of move counts from the nearest start, with -1 for unreached cells."""
+    distances, _ = _wavefront(maze, starts, goals)
+    return distances.reshape(maze.num_rows, maze.num_cols)
+
+
+def bfs_path(maze, starts: Iterable[int], goals: Iterable[int]) -> Optional[List[int]]:
+    """Return the cell ids of a shortest path from any start to the nearest goal, or None if none is reachable."""
+    goals = list(goals)
+    distances, parents = _wavefront(maze, starts, goals)
+    goal_ids = np.asarray(goals, dtype=np.int64)
+    reached = goal_ids[distances[goal_ids] >= 0]
+    if not reached.size:
+        return None
+
+    current = int(reached[np.argmin(distances[reached])])
+    path = [current]
+    parents = parents.tolist()
+    while parents[current] >= 0:
+        current = parents[current]
+        path.append(current)
+    path.reverse()
+    return path
+
+
+def dead_end_fill(maze, keep: Iterable[int]) -> "np.ndarray":
+    """Return a flat boolean array marking the cells sealed off by dead-end filling.
+
+    Every cell with at most one open side is a dead end. All dead ends are filled at once, their open neighbors
+    lose a side, and the neighbors that became dead ends are filled in the next round, until none are left. Cells
+    in keep (the starts and goals) are never filled. On a perfect maze only the corridors between the kept cells
+    remain; on a maze with loops the loops remain as well."""
+    _require_numpy()
+    table = neighbor_table(maze)
+    size = table.shape[0]
+    degree = (table >= 0).sum(axis=1)
+    protected = np.zeros(size, dtype=bool)
+    protected[np.fromiter(keep, dtype=np.int64)] = True
+    filled = np.zeros(size, dtype=bool)
+
+    dead_ends = np.flatnonzero((degree <= 1) & ~protected)
+    while dead_ends.size:
+        filled[dead_ends] = True
+        neighbors = table[dead_ends].ravel()
+        neighbors = neighbors[neighbors >= 0]
+        neighbors = neighbors[~filled[neighbors]]
+        np.subtract.at(degree, neighbors, 1)
+        neighbors = np.unique(neighbors)
+        dead_ends = neighbors[(degree[neighbors] <= 1) & ~protected[neighbors]]
+    return filled
+
+
+def dead_end_path(maze, starts: Iterable[int], goals: Iterable[int]) -> Optional[List[int]]:
+    """Return a path from a start to a goal through the cells left open by dead-end filling, or None if there is none.
+
+    The surviving cells are few, so they are searched with a plain breadth-first search over their table rows."""
+    starts, goals = list(starts), set(goals)
+    filled = dead_end_fill(maze, starts + list(goals))
+    remaining = np.flatnonzero(~filled)
+    rows = dict(zip(remaining.tolist(), neighbor_table(maze)[remaining].tolist()))
+
+    parents = {start: None for start in starts}
+    queue = deque(parents)
+    while queue:
+        current = queue.popleft()
+        if current in goals:
+            path = [current]
+            while parents[path[-1]] is not None:
+                path.append(parents[path[-1]])
+            path.reverse()
+            return path
+        for neighbor in rows[current]:
+            if neighbor >= 0 and neighbor in rows and neighbor not in parents:
+                parents[neighbor] = current
+                queue.append(neighbor)
+    return None